@@ -14,6 +14,7 @@ from app.admin.schemas import (
 )
 from sqlalchemy.orm import joinedload
 from app.core.security import get_password_hash
+from app.vector_logic.intent_router import invalidate_domain_registry_cache
 from sqlalchemy import func
 
 # Concurrency management
@@ -136,8 +137,8 @@ def create_user(
     Create a new user (admin only).
     """
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
+    existing_user_id = db.query(User.id).filter(User.email == user_data.email).scalar()
+    if existing_user_id is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -223,8 +224,8 @@ def update_user(
     
     # Check if email is being updated and if it already exists
     if user_update.email and user_update.email != user.email:
-        existing_user = db.query(User).filter(User.email == user_update.email).first()
-        if existing_user:
+        existing_user_id = db.query(User.id).filter(User.email == user_update.email).scalar()
+        if existing_user_id is not None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
@@ -801,6 +802,7 @@ def create_domain(
     )
     db.add(new_domain)
     db.commit()
+    invalidate_domain_registry_cache()
     db.refresh(new_domain)
     
     return new_domain
@@ -830,6 +832,7 @@ def delete_domain(
         db.delete(doc)
     db.delete(domain)
     db.commit()
+    invalidate_domain_registry_cache()
     return None
 
 
@@ -872,6 +875,7 @@ def update_domain(
     if domain_update.is_active is not None:
         domain.is_active = domain_update.is_active
     db.commit()
+    invalidate_domain_registry_cache()
     db.refresh(domain)
     return domain
 
@@ -23,8 +23,8 @@ def register(user_data: UserRegister, db: Session = Depends(get_db)):
     Register a new user.
     """
     # Check if email already exists
-    db_user = db.query(User).filter(User.email == user_data.email).first()
-    if db_user:
+    existing_user_id = db.query(User.id).filter(User.email == user_data.email).scalar()
+    if existing_user_id is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
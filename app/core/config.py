@@ -13,19 +13,25 @@ class Settings(BaseSettings):
     pool_size: int = max(5, multiprocessing.cpu_count())  # Scale with CPU cores
     max_overflow: int = 20  # Increased for better concurrency
     pool_pre_ping: bool = True
+    pool_use_lifo: bool = True  # LIFO keeps hot connections (and their PRAGMA/page cache) in use
     pool_recycle: int = 3600  # Recycle connections after 1 hour
     pool_timeout: int = 30  # Timeout for getting connection from pool
     # SQLite-specific settings for multiprocessing
     sqlite_timeout: int = 20  # SQLite connection timeout in seconds
     sqlite_check_same_thread: bool = False  # Allow connections from different threads
+    sqlite_cached_statements: int = 256  # Prepared statements kept per SQLite connection (driver default 128)
+    query_cache_size: int = 1000  # SQLAlchemy compiled-SQL cache entries per engine (default 500)
     # Vector processing delay (in seconds)
     vector_processing_delay: int = 5
     # OpenAI API key for description generation
     openai_api_key: str | None = None
+    # Reuse generated document/category descriptions for identical inputs (content + metadata)
+    description_cache_enabled: bool = True
     # JWT Authentication settings
     secret_key: str = "your-secret-key-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 480  # 8 hours for better UX
+    bcrypt_rounds: int = 12  # bcrypt cost factor (log2 iterations) for password hashing
     # ChromaDB settings
     chromadb_persist_directory: str | None = None  # Auto-detected if None
     # Retrieval tuning: relevance distance threshold (higher = more tolerant)
@@ -34,6 +40,8 @@ class Settings(BaseSettings):
     max_workers: int = max(1, multiprocessing.cpu_count() - 1)  # For embedding generation
     # Tokenizers parallelism setting (for huggingface tokenizers)
     tokenizers_parallelism: str | None = None  # Set to "true" or "false" to control tokenizers parallelism
+    # Log 1 in N timing spans from app.utils.timing (1 = log every span)
+    timing_log_sample_every: int = 1
 
     # Chunking / OpenAI safety settings
     model_context_limit: int = 128000  # Target model context window (tokens), e.g., GPT-4o (128k)
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 
@@ -75,28 +76,10 @@ app.include_router(admin_router, prefix="/api/v1")
 app.include_router(slack_router, prefix="/api/v1")
 
 
-@app.on_event("startup")
-async def on_startup():
+def _prepare_database():
     """
-    Optimized startup event:
-    1. Initialize database connections
-    2. Run migrations
-    3. Create tables
-    4. Initialize ChromaDB
-    5. Lazy load routers
+    Run migrations and create tables (blocking; executed off the event loop).
     """
-    logger.info("Starting ASKMOJO Backend...")
-    
-    # Step 0: Initialize structured logging for the new pipeline
-    from app.utils.logging import setup_logging
-    setup_logging()
-    
-    # Step 1: Initialize SQLite database connection
-    logger.info("Initializing SQLite database...")
-    if not init_db():
-        logger.error("Failed to initialize database connection")
-        raise RuntimeError("Database initialization failed")
-    
     # Step 2: Run migrations (add missing columns)
     logger.info("Running database migrations...")
     try:
@@ -116,15 +99,42 @@ async def on_startup():
     except Exception as e:
         logger.error(f"Error creating tables: {e}")
         raise
+
+
+@app.on_event("startup")
+async def on_startup():
+    """
+    Optimized startup event:
+    1. Initialize database connections
+    2. Run migrations and create tables (in a worker thread)
+    3. Initialize ChromaDB (concurrently with step 2)
+    4. Lazy load routers
+    """
+    logger.info("Starting ASKMOJO Backend...")
+    
+    # Step 0: Initialize structured logging for the new pipeline
+    from app.utils.logging import setup_logging
+    setup_logging()
+    
+    # Step 1: Initialize SQLite database connection
+    logger.info("Initializing SQLite database...")
+    if not init_db():
+        logger.error("Failed to initialize database connection")
+        raise RuntimeError("Database initialization failed")
     
-    # Step 4: Initialize ChromaDB
-    logger.info("Initializing ChromaDB...")
-    if not init_chromadb():
+    # Steps 2-3: Migrations + table creation run in a worker thread so they
+    # overlap with ChromaDB initialization instead of blocking the event loop.
+    loop = asyncio.get_running_loop()
+    _, chroma_ok = await asyncio.gather(
+        loop.run_in_executor(None, _prepare_database),
+        loop.run_in_executor(None, init_chromadb),
+    )
+    if not chroma_ok:
         logger.warning("ChromaDB initialization failed - vector operations may not work")
     else:
         logger.info("[OK] ChromaDB ready")
     
-    # Step 5: Initialize Slack Socket Mode (if configured)
+    # Step 4: Initialize Slack Socket Mode (if configured)
     logger.info("Checking Slack Socket Mode configuration...")
     try:
         from app.sqlite.database import SessionLocal
@@ -10,7 +10,13 @@ from __future__ import annotations
 from typing import Any
 
 from app.schemas.intent import IntentDecision, QuestionIntent, QuestionAttribute
-from app.utils.text import extract_entity, infer_core_fear, infer_answer_mode
+from app.utils.text import (
+    CLARIFICATION_PHRASES,
+    extract_entity,
+    infer_answer_mode_lc,
+    infer_core_fear_lc,
+    prep_question,
+)
 from app.utils.logging import get_logger
 
 # Re-export from existing module so nothing breaks
@@ -53,18 +59,14 @@ def build_intent_decision(
     intent, hints = classify_intent(question)
     attribute = map_intent_to_attribute(intent)
     entity = extract_entity(question)
-    core_fear = infer_core_fear(question)
-    answer_mode = infer_answer_mode(question)
+    # Lowercase once and share it across the keyword heuristics
+    q_lc = prep_question(question)
+    core_fear = infer_core_fear_lc(q_lc)
+    answer_mode = infer_answer_mode_lc(q_lc)
 
     conv = conversation_history or []
     is_follow_up = len(conv) > 0
-    is_clarification = any(
-        w in question.lower()
-        for w in [
-            "what do you mean", "can you explain", "clarify",
-            "elaborate", "more details", "again",
-        ]
-    )
+    is_clarification = any(w in q_lc for w in CLARIFICATION_PHRASES)
 
     decision = IntentDecision(
         intent=intent,
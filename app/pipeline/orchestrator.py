@@ -127,7 +127,11 @@ async def _run_stage_1(ctx: PipelineContext, db: Session) -> PipelineContext:
     ctx.intent_decision = intent_decision
 
     # 1b. Try metadata short-circuit
-    categories = db.query(Category).filter(Category.is_active == True).all()
+    # Conversational replies are templated: skip the category query for them
+    if intent_decision.attribute == QuestionAttribute.METADATA_ONLY:
+        categories = []
+    else:
+        categories = db.query(Category).filter(Category.is_active == True).all()
     meta_response = try_metadata_short_circuit(
         intent_decision, ctx.raw_question, db, categories,
     )
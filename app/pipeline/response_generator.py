@@ -33,6 +33,13 @@ from app.utils.logging import get_logger
 
 logger = get_logger("askmojo.pipeline.response_generator")
 
+# Keyword tables (substring checks against lowercased text)
+_QUESTION_WORDS = ("what", "how", "why", "when", "where", "who", "which", "explain", "describe", "tell me")
+_COMPARISON_WORDS = ("different", "difference", "compare", "instead of")
+_PROOF_PHRASES = ("handled", "experience", "before", "proof", "scale")
+_CASE_DOMAINS = ("fintech", "health", "healthcare", "bfsi", "bank", "finance", "saas")
+_CASE_PROBLEMS = ("bug", "crash", "flaky", "failure", "downtime", "compliance", "slow", "latency")
+
 
 
 async def generate_response(ctx: PipelineContext) -> FinalResponse:
@@ -40,18 +47,13 @@ async def generate_response(ctx: PipelineContext) -> FinalResponse:
     Full Stage 3: answer generation, quality evaluation, and
     optional refinement.
     """
+    raw_question_lc = ctx.raw_question.lower()
     # --- Comparison question detection ---
-    is_comparison = any(
-        w in ctx.raw_question.lower()
-        for w in ["different", "difference", "compare", "instead of"]
-    )
+    is_comparison = any(w in raw_question_lc for w in _COMPARISON_WORDS)
     # --- Discovery question detection ---
-    is_discovery_question = "discovery" in ctx.raw_question.lower()
+    is_discovery_question = "discovery" in raw_question_lc
     # --- Proof-type question detection ---
-    is_proof_question = any(
-        phrase in ctx.raw_question.lower()
-        for phrase in ["handled", "experience", "before", "proof", "scale"]
-    )
+    is_proof_question = any(phrase in raw_question_lc for phrase in _PROOF_PHRASES)
 
     # --- Multi-problem mapping detection ---
     def extract_list_items(question: str) -> list[str]:
@@ -82,11 +84,7 @@ async def generate_response(ctx: PipelineContext) -> FinalResponse:
     is_multi_problem = len(list_items) >= 2
 
     # ── 1. Model selection ──────────────────────────────────────────
-    question_words = [
-        "what", "how", "why", "when", "where", "who",
-        "which", "explain", "describe", "tell me",
-    ]
-    has_complex = any(w in ctx.raw_question.lower() for w in question_words)
+    has_complex = any(w in raw_question_lc for w in _QUESTION_WORDS)
 
     model_sel = select_model(
         answer_mode=intent.answer_mode,
@@ -459,7 +457,7 @@ def _extract_proof_snippet(retrieval: RetrievalResult) -> str | None:
         text = (c.chunk_text + " " + c.document_title).lower()
 
         if not domain:
-            for d in ["fintech", "health", "healthcare", "bfsi", "bank", "finance", "saas"]:
+            for d in _CASE_DOMAINS:
                 if d in text:
                     domain = d.capitalize()
                     break
@@ -473,7 +471,7 @@ def _extract_proof_snippet(retrieval: RetrievalResult) -> str | None:
                 scale = m.group(1)
 
         if not problem:
-            for p in ["bug", "crash", "flaky", "failure", "downtime", "compliance", "slow", "latency"]:
+            for p in _CASE_PROBLEMS:
                 if p in text:
                     problem = p
                     break
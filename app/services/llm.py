@@ -108,6 +108,26 @@ def count_tokens(text: str) -> int:
     return max(1, len(text) // 4)
 
 
+def truncate_to_tokens(text: str, max_tokens: int) -> tuple[str, bool]:
+    """
+    Trim text to at most ``max_tokens`` tokens (tiktoken when available,
+    else ≈ 4 chars per token). Returns (text, was_truncated).
+    """
+    enc = None
+    if _tiktoken_lib is not None:
+        try:
+            enc = _get_encoder()
+        except Exception as e:  # e.g. BPE file cannot be downloaded offline
+            logger.warning("tiktoken encoder unavailable (%s); truncating by characters", e)
+    if enc is None:
+        max_chars = max_tokens * 4
+        return (text[:max_chars], True) if len(text) > max_chars else (text, False)
+    tokens = enc.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text, False
+    return enc.decode(tokens[:max_tokens]), True
+
+
 # ── TOON encoding ───────────────────────────────────────────────────
 def convert_to_toon(
     data: Any,
@@ -15,6 +15,8 @@ class Base(DeclarativeBase):
 connect_args = {
     "check_same_thread": settings.sqlite_check_same_thread,
     "timeout": settings.sqlite_timeout,
+    # Repeated query shapes skip re-preparing their statement on a warm connection
+    "cached_statements": settings.sqlite_cached_statements,
 }
 
 # Enable WAL (Write-Ahead Logging) mode for better concurrency
@@ -50,6 +52,8 @@ if settings.database_url.startswith("sqlite"):
         pool_size=max(5, settings.pool_size or 5),
         max_overflow=max(10, settings.max_overflow or 10),
         pool_pre_ping=settings.pool_pre_ping,
+        pool_use_lifo=settings.pool_use_lifo,  # Reuse the most recently returned (warm) connection
+        query_cache_size=settings.query_cache_size,  # Compiled SQL reused across requests
         echo=False,  # Set to True for SQL query logging in development
         future=True,  # Use 2.0 style
     )
@@ -61,8 +65,10 @@ else:
         pool_size=settings.pool_size,
         max_overflow=settings.max_overflow,
         pool_pre_ping=settings.pool_pre_ping,
+        pool_use_lifo=settings.pool_use_lifo,
         pool_recycle=settings.pool_recycle,
         pool_timeout=settings.pool_timeout,
+        query_cache_size=settings.query_cache_size,
         echo=False,
         future=True,
     )
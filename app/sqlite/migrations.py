@@ -1,31 +1,93 @@
 """
 Database migration utilities to add missing columns to existing tables.
+
+Renames and drops should go through rename_column() / drop_column(), which
+use SQLite's native ALTER TABLE ... RENAME COLUMN (3.25+) and DROP COLUMN
+(3.35+). These rewrite only the schema entry, so they avoid the
+CREATE-new / INSERT-copy / DROP / RENAME table rebuild on large tables.
 """
+import sqlite3
+
 from sqlalchemy import text, inspect
 from app.sqlite.database import engine
 
 
-def migrate_documents_table():
+def _sqlite_supports_rename_column() -> bool:
+    """ALTER TABLE ... RENAME COLUMN is available from SQLite 3.25.0."""
+    return sqlite3.sqlite_version_info >= (3, 25, 0)
+
+
+def _sqlite_supports_drop_column() -> bool:
+    """ALTER TABLE ... DROP COLUMN is available from SQLite 3.35.0."""
+    return sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+def rename_column(conn, table: str, old: str, new: str):
+    """
+    Rename a column in place using the native ALTER TABLE statement.
+    """
+    if engine.dialect.name == "sqlite" and not _sqlite_supports_rename_column():
+        raise RuntimeError(
+            f"SQLite {sqlite3.sqlite_version} cannot rename {table}.{old}; 3.25.0+ is required"
+        )
+    conn.execute(text(f'ALTER TABLE "{table}" RENAME COLUMN "{old}" TO "{new}"'))
+
+
+def drop_column(conn, table: str, column: str):
+    """
+    Drop a column in place using the native ALTER TABLE statement.
+
+    SQLite refuses to drop columns that are indexed, part of a key, or
+    referenced by triggers/views; drop those dependants first.
+    """
+    if engine.dialect.name == "sqlite" and not _sqlite_supports_drop_column():
+        raise RuntimeError(
+            f"SQLite {sqlite3.sqlite_version} cannot drop {table}.{column}; 3.35.0+ is required"
+        )
+    conn.execute(text(f'ALTER TABLE "{table}" DROP COLUMN "{column}"'))
+
+
+def _load_schema() -> dict[str, set[str]]:
+    """
+    Map every table name to its set of column names.
+
+    On SQLite this is a single query (sqlite_master joined with
+    pragma_table_info) instead of one PRAGMA round-trip per table.
+    """
+    if engine.dialect.name != "sqlite":
+        inspector = inspect(engine)
+        return {
+            table: {col["name"] for col in inspector.get_columns(table)}
+            for table in inspector.get_table_names()
+        }
+
+    schema: dict[str, set[str]] = {}
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT m.name, p.name FROM sqlite_master AS m "
+            "JOIN pragma_table_info(m.name) AS p "
+            "WHERE m.type = 'table'"
+        ))
+        for table, column in rows:
+            schema.setdefault(table, set()).add(column)
+    return schema
+
+
+def migrate_documents_table(schema: dict[str, set[str]] | None = None):
     """
     Add missing columns to the documents table if they don't exist.
     """
-    inspector = inspect(engine)
+    if schema is None:
+        schema = _load_schema()
     
     # Check if documents table exists
-    if "documents" not in inspector.get_table_names():
+    if "documents" not in schema:
         return  # Table doesn't exist, will be created by create_all()
     
     # Get existing columns
-    existing_columns = [col["name"] for col in inspector.get_columns("documents")]
+    existing_columns = schema["documents"]
     
     with engine.connect() as conn:
-        # Enforce unique constraint on (file_name, domain_id)
-        try:
-            conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS idx_documents_file_name_domain_id ON documents(file_name, domain_id)"))
-            conn.commit()
-            print("[OK] Enforced unique constraint on (file_name, domain_id) in documents table")
-        except Exception as e:
-            print(f"[WARN] Could not create unique index on documents: {e}")
         # Add source_type if missing (with default value for existing rows)
         if "source_type" not in existing_columns:
             print("Adding 'source_type' column to documents table...")
@@ -68,21 +130,40 @@ def migrate_documents_table():
             conn.commit()
             print("[OK] Added 'doc_type' column to documents table")
 
-        # Optionally, clean up duplicates before enforcing unique constraint (manual step if needed)
+        # Enforce unique constraint on (file_name, domain_id). Duplicates are
+        # removed first (keeping the oldest row) in the same transaction, so a
+        # dirty table doesn't fail the index creation on every startup.
+        # Rows with a NULL in either column never conflict and are left alone.
+        try:
+            conn.execute(text(
+                "DELETE FROM documents "
+                "WHERE file_name IS NOT NULL AND domain_id IS NOT NULL "
+                "AND id NOT IN ("
+                "SELECT MIN(id) FROM documents "
+                "WHERE file_name IS NOT NULL AND domain_id IS NOT NULL "
+                "GROUP BY file_name, domain_id)"
+            ))
+            conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS idx_documents_file_name_domain_id ON documents(file_name, domain_id)"))
+            conn.commit()
+            print("[OK] Enforced unique constraint on (file_name, domain_id) in documents table")
+        except Exception as e:
+            conn.rollback()
+            print(f"[WARN] Could not create unique index on documents: {e}")
 
 
-def migrate_document_chunks_table():
+def migrate_document_chunks_table(schema: dict[str, set[str]] | None = None):
     """
     Add missing columns to the document_chunks table if they don't exist.
     """
-    inspector = inspect(engine)
+    if schema is None:
+        schema = _load_schema()
     
     # Check if document_chunks table exists
-    if "document_chunks" not in inspector.get_table_names():
+    if "document_chunks" not in schema:
         return  # Table doesn't exist, will be created by create_all()
     
     # Get existing columns
-    existing_columns = [col["name"] for col in inspector.get_columns("document_chunks")]
+    existing_columns = schema["document_chunks"]
     
     with engine.connect() as conn:
         # Add version if missing (version number, denormalized for quick access)
@@ -93,18 +174,19 @@ def migrate_document_chunks_table():
             print("[OK] Added 'version' column to document_chunks")
 
 
-def migrate_users_table():
+def migrate_users_table(schema: dict[str, set[str]] | None = None):
     """
     Add missing columns to the users table if they don't exist.
     """
-    inspector = inspect(engine)
+    if schema is None:
+        schema = _load_schema()
     
     # Check if users table exists
-    if "users" not in inspector.get_table_names():
+    if "users" not in schema:
         return  # Table doesn't exist, will be created by create_all()
     
     # Get existing columns
-    existing_columns = [col["name"] for col in inspector.get_columns("users")]
+    existing_columns = schema["users"]
     
     with engine.connect() as conn:
         # Add password if missing (required for authentication)
@@ -155,60 +237,64 @@ def migrate_users_table():
         # Note: SQLite doesn't support ALTER COLUMN, so we'll handle this in application logic
 
 
-def migrate_slack_integrations_table():
+def migrate_slack_integrations_table(schema: dict[str, set[str]] | None = None):
     """
     Create slack_integrations table if it doesn't exist.
     This table is created by Base.metadata.create_all(), but we include it here for completeness.
     """
-    inspector = inspect(engine)
+    if schema is None:
+        schema = _load_schema()
     
     # Check if slack_integrations table exists
-    if "slack_integrations" not in inspector.get_table_names():
+    if "slack_integrations" not in schema:
         return  # Table doesn't exist, will be created by create_all()
     
     # Table should already exist if models are imported
     print("[OK] slack_integrations table exists")
 
 
-def migrate_slack_users_table():
+def migrate_slack_users_table(schema: dict[str, set[str]] | None = None):
     """
     Create slack_users table if it doesn't exist.
     This table is created by Base.metadata.create_all(), but we include it here for completeness.
     """
-    inspector = inspect(engine)
+    if schema is None:
+        schema = _load_schema()
     
     # Check if slack_users table exists
-    if "slack_users" not in inspector.get_table_names():
+    if "slack_users" not in schema:
         return  # Table doesn't exist, will be created by create_all()
     
     # Table should already exist if models are imported
     print("[OK] slack_users table exists")
 
 
-def migrate_categories_table():
+def migrate_categories_table(schema: dict[str, set[str]] | None = None):
     """
     Create categories table if it doesn't exist.
     This table is created by Base.metadata.create_all(), but we include it here for completeness.
     """
-    inspector = inspect(engine)
+    if schema is None:
+        schema = _load_schema()
     
     # Check if categories table exists
-    if "categories" not in inspector.get_table_names():
+    if "categories" not in schema:
         return  # Table doesn't exist, will be created by create_all()
     
     # Table should already exist if models are imported
     print("[OK] categories table exists")
 
 
-def migrate_categories_add_domain():
+def migrate_categories_add_domain(schema: dict[str, set[str]] | None = None):
     """
     Add 'domain' column to categories table if it doesn't exist and create an index for it.
     """
-    inspector = inspect(engine)
-    if "categories" not in inspector.get_table_names():
+    if schema is None:
+        schema = _load_schema()
+    if "categories" not in schema:
         return
 
-    existing_columns = [col["name"] for col in inspector.get_columns("categories")]
+    existing_columns = schema["categories"]
 
     with engine.connect() as conn:
         if "domain" not in existing_columns:
@@ -226,19 +312,20 @@ def migrate_categories_add_domain():
             print(f"Info: Could not create index on categories.domain: {e}")
 
 
-def migrate_documents_category_id():
+def migrate_documents_category_id(schema: dict[str, set[str]] | None = None):
     """
     Add category_id column to documents table if it doesn't exist.
     This allows documents to reference the categories table via foreign key.
     """
-    inspector = inspect(engine)
+    if schema is None:
+        schema = _load_schema()
     
     # Check if documents table exists
-    if "documents" not in inspector.get_table_names():
+    if "documents" not in schema:
         return  # Table doesn't exist, will be created by create_all()
     
     # Get existing columns
-    existing_columns = [col["name"] for col in inspector.get_columns("documents")]
+    existing_columns = schema["documents"]
     
     with engine.connect() as conn:
         # Add category_id if missing (nullable foreign key to categories table)
@@ -251,12 +338,45 @@ def migrate_documents_category_id():
             print("[OK] Added 'category_id' column to documents table")
 
 
-def migrate_document_upload_logs_table():
+def migrate_documents_partial_indexes(schema: dict[str, set[str]] | None = None):
+    """
+    Create partial indexes on documents for the processed-only lookups used by
+    the metadata handlers (counts/listings by category, domain and doc type).
+
+    New databases get them from the model's __table_args__; this covers
+    existing tables. Must run after the columns they cover have been added.
+    """
+    if schema is None:
+        schema = _load_schema()
+
+    if "documents" not in schema:
+        return  # Table doesn't exist, will be created by create_all()
+
+    indexes = (
+        ("idx_documents_processed_category_id", "category_id"),
+        ("idx_documents_processed_domain_id_doc_type", "domain_id, doc_type"),
+        ("idx_documents_processed_doc_type", "doc_type"),
+    )
+    with engine.connect() as conn:
+        try:
+            for name, columns in indexes:
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS {name} ON documents({columns}) WHERE processed = 1"
+                ))
+            conn.commit()
+            print("[OK] Ensured partial indexes on processed documents")
+        except Exception as e:
+            conn.rollback()
+            print(f"[WARN] Could not create partial indexes on documents: {e}")
+
+
+def migrate_document_upload_logs_table(schema: dict[str, set[str]] | None = None):
     """
     Add time and token usage fields to document_upload_logs table if they don't exist.
     """
-    inspector = inspect(engine)
-    if "document_upload_logs" not in inspector.get_table_names():
+    if schema is None:
+        schema = _load_schema()
+    if "document_upload_logs" not in schema:
         print("Creating 'document_upload_logs' table...")
         # Table will be created by Base.metadata.create_all()
         return
@@ -264,7 +384,7 @@ def migrate_document_upload_logs_table():
     print("[OK] 'document_upload_logs' table exists")
     
     # Add new fields if they don't exist
-    existing_columns = [col["name"] for col in inspector.get_columns("document_upload_logs")]
+    existing_columns = schema["document_upload_logs"]
     
     with engine.connect() as conn:
         # Add time tracking fields
@@ -296,12 +416,13 @@ def migrate_document_upload_logs_table():
                 conn.rollback()
 
 
-def migrate_slack_integrations_socket_mode():
+def migrate_slack_integrations_socket_mode(schema: dict[str, set[str]] | None = None):
     """
     Add Socket Mode fields to slack_integrations table if they don't exist.
     """
-    inspector = inspect(engine)
-    if "slack_integrations" not in inspector.get_table_names():
+    if schema is None:
+        schema = _load_schema()
+    if "slack_integrations" not in schema:
         print("Creating 'slack_integrations' table...")
         # Table will be created by Base.metadata.create_all()
         return
@@ -309,7 +430,7 @@ def migrate_slack_integrations_socket_mode():
     print("[OK] 'slack_integrations' table exists")
     
     # Add new fields if they don't exist
-    existing_columns = [col["name"] for col in inspector.get_columns("slack_integrations")]
+    existing_columns = schema["slack_integrations"]
     
     with engine.connect() as conn:
         # Add Socket Mode fields
@@ -321,12 +442,13 @@ def migrate_slack_integrations_socket_mode():
             print("[OK] Added Socket Mode columns")
 
 
-def migrate_query_logs_table():
+def migrate_query_logs_table(schema: dict[str, set[str]] | None = None):
     """
     Add comprehensive logging fields to query_logs table if they don't exist.
     """
-    inspector = inspect(engine)
-    if "query_logs" not in inspector.get_table_names():
+    if schema is None:
+        schema = _load_schema()
+    if "query_logs" not in schema:
         print("Creating 'query_logs' table...")
         # Table will be created by Base.metadata.create_all()
         return
@@ -334,7 +456,7 @@ def migrate_query_logs_table():
     print("[OK] 'query_logs' table exists")
     
     # Add new comprehensive logging fields if they don't exist
-    existing_columns = [col["name"] for col in inspector.get_columns("query_logs")]
+    existing_columns = schema["query_logs"]
     
     with engine.connect() as conn:
         # Add answer field
@@ -378,14 +500,15 @@ def migrate_query_logs_table():
             print("[OK] Added 'slack_user_email' column")
 
 
-def migrate_domain_required_triggers():
+def migrate_domain_required_triggers(schema: dict[str, set[str]] | None = None):
     """Enforce domain_id as required at the DB layer (SQLite triggers).
 
     SQLite cannot ALTER a column to NOT NULL in-place; triggers give us a strong
     guarantee for new writes without rebuilding tables.
     """
-    inspector = inspect(engine)
-    tables = set(inspector.get_table_names())
+    if schema is None:
+        schema = _load_schema()
+    tables = set(schema)
 
     with engine.connect() as conn:
         if "documents" in tables:
@@ -467,21 +590,23 @@ def run_migrations():
     Run all migrations.
     """
     print("Running database migrations...")
-    migrate_users_table()
-    migrate_documents_table()
-    migrate_document_chunks_table()
-    migrate_slack_integrations_table()
-    migrate_slack_users_table()
-    migrate_categories_table()
-    migrate_categories_add_domain()
-    migrate_documents_category_id()
-    migrate_document_upload_logs_table()
-    migrate_slack_integrations_socket_mode()
-    migrate_query_logs_table()
-    migrate_domain_required_triggers()
+    # Introspect every table's columns once and share the result
+    schema = _load_schema()
+    migrate_users_table(schema)
+    migrate_documents_table(schema)
+    migrate_document_chunks_table(schema)
+    migrate_slack_integrations_table(schema)
+    migrate_slack_users_table(schema)
+    migrate_categories_table(schema)
+    migrate_categories_add_domain(schema)
+    migrate_documents_category_id(schema)
+    migrate_documents_partial_indexes(schema)
+    migrate_document_upload_logs_table(schema)
+    migrate_slack_integrations_socket_mode(schema)
+    migrate_query_logs_table(schema)
+    migrate_domain_required_triggers(schema)
     # Enforce unique constraint on domain name
-    inspector = inspect(engine)
-    if "domains" in inspector.get_table_names():
+    if "domains" in schema:
         with engine.connect() as conn:
             try:
                 conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS idx_domains_name ON domains(name)"))
@@ -490,4 +615,27 @@ def run_migrations():
             except Exception as e:
                 print(f"[WARN] Could not create unique index on domains.name: {e}")
     print("Migrations complete!")
+    _refresh_planner_stats()
+
+
+def _refresh_planner_stats():
+    """
+    Give SQLite's query planner statistics for the indexes created above.
+
+    A full ANALYZE only runs the first time (no sqlite_stat1 table yet);
+    later boots use PRAGMA optimize, which only re-analyzes when needed.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.connect() as conn:
+        try:
+            has_stats = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+            )).first() is not None
+            if not has_stats:
+                conn.execute(text("ANALYZE"))
+            conn.execute(text("PRAGMA optimize"))
+            conn.commit()
+        except Exception as e:
+            print(f"[WARN] Could not refresh query planner statistics: {e}")
 
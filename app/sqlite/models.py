@@ -7,6 +7,8 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Float,
+    Index,
+    text,
 )
 from sqlalchemy.orm import relationship
 
@@ -31,6 +33,13 @@ class User(Base):
 
 class Document(Base):
     __tablename__ = "documents"
+    # Partial indexes for the metadata handlers, which only ever count/list
+    # processed documents (kept in sync with migrate_documents_partial_indexes)
+    __table_args__ = (
+        Index("idx_documents_processed_category_id", "category_id", sqlite_where=text("processed = 1")),
+        Index("idx_documents_processed_domain_id_doc_type", "domain_id", "doc_type", sqlite_where=text("processed = 1")),
+        Index("idx_documents_processed_doc_type", "doc_type", sqlite_where=text("processed = 1")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False, index=True)
@@ -49,8 +58,9 @@ class Document(Base):
 
     # Relationships
     uploader = relationship("User", back_populates="documents")
-    category_ref = relationship("Category", back_populates="documents")
-    domain_ref = relationship("Domain")
+    # Many-to-one lookups read alongside most documents: load in the same SELECT (LEFT OUTER JOIN)
+    category_ref = relationship("Category", back_populates="documents", lazy="joined")
+    domain_ref = relationship("Domain", lazy="joined")
     versions = relationship("DocumentVersion", back_populates="document", cascade="all, delete-orphan")
     chunks = relationship("DocumentChunk", back_populates="document", cascade="all, delete-orphan")
     query_sources = relationship("QuerySource", back_populates="document")
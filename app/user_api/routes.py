@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.sqlite.database import get_db
 from app.sqlite.models import User
 from app.user_api.schemas import UserCreate, UserUpdate, UserResponse
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash, verify_password
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -15,14 +17,6 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
     Create a new user.
     Note: For production, consider requiring authentication for user creation.
     """
-    # Check if email already exists
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if db_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-    
     # Hash password before storing
     user_data = user.model_dump()
     password = user_data.pop("password")
@@ -34,7 +28,15 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
         is_active=True
     )
     db.add(new_user)
-    db.commit()
+    # Email uniqueness is enforced by the users.email UNIQUE constraint
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
     db.refresh(new_user)
     return new_user
 
@@ -44,8 +46,14 @@ def get_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """
     Get all users with pagination.
     """
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+    # Select only the columns UserResponse serializes (skips the password hash)
+    # and build responses from plain rows: no ORM hydration, no re-validation
+    rows = db.execute(
+        select(User.id, User.name, User.email, User.role, User.is_active, User.created_at)
+        .offset(skip)
+        .limit(limit)
+    ).all()
+    return [UserResponse.model_construct(**row._mapping) for row in rows]
 
 
 @router.get("/{user_id}", response_model=UserResponse)
@@ -53,7 +61,7 @@ def get_user(user_id: int, db: Session = Depends(get_db)):
     """
     Get a specific user by ID.
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -67,32 +75,38 @@ def update_user(user_id: int, user_update: UserUpdate, db: Session = Depends(get
     """
     Update a user by ID.
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User with id {user_id} not found"
         )
     
-    # Check if email is being updated and if it already exists
-    if user_update.email and user_update.email != user.email:
-        existing_user = db.query(User).filter(User.email == user_update.email).first()
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
-    
     # Update only provided fields
     update_data = user_update.model_dump(exclude_unset=True, exclude={"password"})
     for field, value in update_data.items():
         setattr(user, field, value)
     
-    # Handle password update separately (hash it)
+    # Handle password update separately (hash it); skip the re-hash and
+    # column write when the submitted password is the one already stored
     if user_update.password:
-        user.password = get_password_hash(user_update.password)
+        try:
+            unchanged = verify_password(user_update.password, user.password)
+        except (ValueError, TypeError):
+            # Legacy plaintext ('changeme') or NULL password: not a bcrypt hash
+            unchanged = False
+        if not unchanged:
+            user.password = get_password_hash(user_update.password)
     
-    db.commit()
+    # A changed email that collides with another user violates users.email UNIQUE
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
     db.refresh(user)
     return user
 
@@ -102,7 +116,7 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
     """
     Delete a user by ID.
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
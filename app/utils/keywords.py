@@ -0,0 +1,86 @@
+"""
+Priority-ordered keyword classification.
+
+Several heuristics ask the same question: "given categories checked in
+order, which is the first one whose keywords appear in the text?" (or
+"which of these keyword groups appear at all?").
+``KeywordClassifier`` answers both with a single pass over the text using an
+Aho-Corasick automaton (pyahocorasick) when it is installed, falling back
+to plain ``in`` substring checks per category (which CPython runs faster
+than an equivalent regex alternation).
+
+Usage:
+    _FEAR = KeywordClassifier((
+        ("cost", ("cost", "budget")),
+        ("speed", ("slow", "fast")),
+    ))
+    _FEAR.classify("is it fast and within budget?")  # -> "cost"
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+# ── Optional imports with graceful fallbacks ─────────────────────────
+try:
+    import ahocorasick as _ahocorasick
+except ImportError:
+    _ahocorasick = None
+
+
+class KeywordClassifier:
+    """
+    Map text to the first category (in declaration order) that has any of
+    its keywords as a plain substring. Keywords are matched as given, so
+    callers lowercase both the keywords and the text.
+    """
+
+    def __init__(self, categories: Iterable[tuple[str, Iterable[str]]]):
+        cats = tuple((label, tuple(kws)) for label, kws in categories)
+        self.labels: tuple[str, ...] = tuple(label for label, _ in cats)
+
+        self._automaton = None
+        self._categories = cats
+
+        if _ahocorasick is not None and any(kws for _, kws in cats):
+            # keyword -> ranks of every category listing it (ascending)
+            ranks_by_kw: dict[str, list[int]] = {}
+            for rank, (_, kws) in enumerate(cats):
+                for kw in kws:
+                    ranks = ranks_by_kw.setdefault(kw, [])
+                    if rank not in ranks:
+                        ranks.append(rank)
+            automaton = _ahocorasick.Automaton()
+            for kw, ranks in ranks_by_kw.items():
+                automaton.add_word(kw, tuple(ranks))
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def classify(self, text: str) -> str | None:
+        """Return the highest-priority matching category, or None."""
+        if not text:
+            return None
+        if self._automaton is not None:
+            best: int | None = None
+            for _, ranks in self._automaton.iter(text):
+                rank = ranks[0]  # A shared keyword counts for its earliest category
+                if best is None or rank < best:
+                    best = rank
+                    if best == 0:
+                        break
+            return self.labels[best] if best is not None else None
+        for label, kws in self._categories:
+            if any(kw in text for kw in kws):
+                return label
+        return None
+
+    def matching_labels(self, text: str) -> set[str]:
+        """Return every category that has at least one keyword in the text."""
+        if not text:
+            return set()
+        if self._automaton is not None:
+            ranks_hit: set[int] = set()
+            for _, ranks in self._automaton.iter(text):
+                ranks_hit.update(ranks)
+            return {self.labels[rank] for rank in ranks_hit}
+        return {label for label, kws in self._categories if any(kw in text for kw in kws)}
@@ -13,6 +13,8 @@ from __future__ import annotations
 
 import re
 
+from app.utils.keywords import KeywordClassifier
+
 
 # ── Non-entity words (used by entity extractor) ─────────────────────
 _NON_ENTITIES = frozenset({
@@ -23,6 +25,51 @@ _NON_ENTITIES = frozenset({
     "Full", "All", "Any", "Each", "Every", "My", "Our", "Your",
 })
 
+# ── Precompiled patterns ─────────────────────────────────────────────
+_RE_UNDER_WHICH_DOMAIN = re.compile(
+    r"\bunder\s+(?:which|what)\s+domain\s+(.+?)\s+(?:comes?|falls?|belongs?)\s+under\b",
+    re.IGNORECASE,
+)
+_RE_WHICH_DOMAIN = re.compile(
+    r"\bwhich\s+domain\b.*?\b(?:does|do|is)\b\s+(.+?)\s+(?:come|fall|belong)\s+under\b",
+    re.IGNORECASE,
+)
+_RE_POSSESSIVE = re.compile(r"([A-Z][a-zA-Z0-9_\-]+)'s\b")
+_RE_PREP_ENTITY = re.compile(r"(?:for|about|in|of|at|from|by)\s+([A-Z][a-zA-Z0-9_\-]+)")
+_RE_LEADING_ARTICLE = re.compile(r"^(?:the|a|an|any)\s+", re.IGNORECASE)
+_RE_FILEEXT = re.compile(r"\.(pdf|docx?|pptx?)$", re.IGNORECASE)
+_RE_SUFFIX = re.compile(r"\b(Solutions?|Presentation|Report|Updated)\b", re.IGNORECASE)
+_RE_PAREN = re.compile(r"\s*\(\d+\)$")
+_RE_WS = re.compile(r"\s{2,}")
+_RE_ANY_WS = re.compile(r"\s+")
+
+# Spaces and dashes → underscores in a single pass (collection names)
+_COLLECTION_NAME_TRANS = str.maketrans({" ": "_", "-": "_"})
+
+# ── Core fear / answer mode keywords (checked in order; first category wins) ──
+_FEAR_CLASSIFIER = KeywordClassifier((
+    ("cost", ("cost", "expensive", "budget", "price", "afford", "financial", "roi", "investment")),
+    ("speed", ("slow", "fast", "speed", "quick", "quickly", "delay", "time", "acceleration", "reduce time")),
+    ("risk", ("risk", "fail", "crash", "bug", "defect", "stability", "reliable", "safe", "security", "confidence", "unstable")),
+    ("scale", ("scale", "grow", "large", "handle", "capacity", "volume", "load", "users", "growth", "concurrent")),
+    ("trust", ("proof", "evidence", "customer", "case study", "success", "track record", "experience", "credentials")),
+))
+
+_ANSWER_MODE_CLASSIFIER = KeywordClassifier((
+    # Extract mode: user wants a specific value
+    ("extract", ("what is the", "what's the", "what are the", "how much", "how many", "percentage", "number of")),
+    # Brief mode: yes/no or short answer
+    ("brief", ("is there", "do we have", "does it", "can we", "is it possible", "are there")),
+    # Summarize mode: user wants an overview
+    ("summarize", ("summarize", "summary", "overview", "list", "outline", "key points")),
+))
+
+# Phrases that mark a follow-up asking to clarify the previous answer
+CLARIFICATION_PHRASES: tuple[str, ...] = (
+    "what do you mean", "can you explain", "clarify",
+    "elaborate", "more details", "again",
+)
+
 # ── Known solution title mappings ────────────────────────────────────
 _KNOWN_TITLE_MAP: dict[str, str] = {
     "bugbuster": "BugBuster",
@@ -46,8 +93,8 @@ def extract_entity(question: str) -> str | None:
 
     def _clean_entity(value: str) -> str | None:
         v = (value or "").strip().strip("?.,!\"'()")
-        v = re.sub(r"\s+", " ", v)
-        v = re.sub(r"^(?:the|a|an|any)\s+", "", v, flags=re.IGNORECASE)
+        v = _RE_ANY_WS.sub(" ", v)
+        v = _RE_LEADING_ARTICLE.sub("", v)
         if not v:
             return None
         if len(v) < 2:
@@ -55,31 +102,23 @@ def extract_entity(question: str) -> str | None:
         return v
 
     # Pattern 0: Classification phrasing with possibly-lowercase entities
-    m = re.search(
-        r"\bunder\s+(?:which|what)\s+domain\s+(.+?)\s+(?:comes?|falls?|belongs?)\s+under\b",
-        q,
-        flags=re.IGNORECASE,
-    )
+    m = _RE_UNDER_WHICH_DOMAIN.search(q)
     ent = _clean_entity(m.group(1)) if m else None
     if ent:
         return ent
 
-    m = re.search(
-        r"\bwhich\s+domain\b.*?\b(?:does|do|is)\b\s+(.+?)\s+(?:come|fall|belong)\s+under\b",
-        q,
-        flags=re.IGNORECASE,
-    )
+    m = _RE_WHICH_DOMAIN.search(q)
     ent = _clean_entity(m.group(1)) if m else None
     if ent:
         return ent
 
     # Pattern 1: "<Entity>'s" (possessive) — strongest signal
-    match = re.search(r"([A-Z][a-zA-Z0-9_\-]+)'s\b", q)
+    match = _RE_POSSESSIVE.search(q)
     if match and match.group(1) not in _NON_ENTITIES:
         return match.group(1)
 
     # Pattern 2: "for <Entity>" / "about <Entity>" / "in <Entity>" / "of <Entity>"
-    match = re.search(r"(?:for|about|in|of|at|from|by)\s+([A-Z][a-zA-Z0-9_\-]+)", q)
+    match = _RE_PREP_ENTITY.search(q)
     if match and match.group(1) not in _NON_ENTITIES:
         return match.group(1)
 
@@ -108,17 +147,17 @@ def humanize_title(title: str | None) -> str | None:
         return title
     t = title.strip()
     # Remove file extensions
-    t = re.sub(r"\.(pdf|docx?|pptx?)$", "", t, flags=re.IGNORECASE)
+    t = _RE_FILEEXT.sub("", t)
     # Replace underscores/dashes with spaces
     t = t.replace("_", " ")
     # Remove common suffix words
-    t = re.sub(r"\b(Solutions?|Presentation|Report|Updated)\b", "", t, flags=re.IGNORECASE)
+    t = _RE_SUFFIX.sub("", t)
     # Remove parenthetical counters like (1), (2)
-    t = re.sub(r"\s*\(\d+\)$", "", t)
+    t = _RE_PAREN.sub("", t)
     # Normalize whitespace
-    t = re.sub(r"\s{2,}", " ", t).strip()
+    t = _RE_WS.sub(" ", t).strip()
     # Known mappings
-    key = re.sub(r"\s+", " ", t).lower()
+    key = _RE_ANY_WS.sub(" ", t).lower()
     if key in _KNOWN_TITLE_MAP:
         return _KNOWN_TITLE_MAP[key]
     return t or title
@@ -131,7 +170,15 @@ def normalize_collection_name(name: str) -> str:
     Replaces the 6+ scattered `.lower().replace(" ", "_").replace("-", "_")`
     calls in the old routes.py.
     """
-    return (name or "").lower().replace(" ", "_").replace("-", "_")
+    return (name or "").lower().translate(_COLLECTION_NAME_TRANS)
+
+
+def prep_question(question: str | None) -> str:
+    """
+    Normalize a question once (None-guard, strip, lowercase) so callers
+    running several ``*_lc`` inference helpers don't each re-lowercase it.
+    """
+    return (question or "").strip().lower()
 
 
 def infer_doc_type_from_question(question: str) -> str | None:
@@ -140,7 +187,11 @@ def infer_doc_type_from_question(question: str) -> str | None:
 
     Returns: "proposal" | "case_study" | "solution" | None
     """
-    q = (question or "").lower()
+    return infer_doc_type_from_question_lc(prep_question(question))
+
+
+def infer_doc_type_from_question_lc(q: str) -> str | None:
+    """``infer_doc_type_from_question`` for an already ``prep_question``-ed string."""
     if "case study" in q or "case studies" in q or "success story" in q or "success stories" in q:
         return "case_study"
     if "proposal" in q or "proposals" in q:
@@ -154,18 +205,12 @@ def infer_core_fear(question: str) -> str | None:
     """
     Detect the user's core concern/fear: cost, speed, risk, scale, or trust.
     """
-    q = (question or "").lower()
-    if any(w in q for w in ["cost", "expensive", "budget", "price", "afford", "financial", "roi", "investment"]):
-        return "cost"
-    if any(w in q for w in ["slow", "fast", "speed", "quick", "quickly", "delay", "time", "acceleration", "reduce time"]):
-        return "speed"
-    if any(w in q for w in ["risk", "fail", "crash", "bug", "defect", "stability", "reliable", "safe", "security", "confidence", "unstable"]):
-        return "risk"
-    if any(w in q for w in ["scale", "grow", "large", "handle", "capacity", "volume", "load", "users", "growth", "concurrent"]):
-        return "scale"
-    if any(w in q for w in ["proof", "evidence", "customer", "case study", "success", "track record", "experience", "credentials"]):
-        return "trust"
-    return None
+    return infer_core_fear_lc(prep_question(question))
+
+
+def infer_core_fear_lc(q: str) -> str | None:
+    """``infer_core_fear`` for an already ``prep_question``-ed string."""
+    return _FEAR_CLASSIFIER.classify(q)
 
 
 def infer_answer_mode(question: str) -> str:
@@ -174,22 +219,10 @@ def infer_answer_mode(question: str) -> str:
 
     Returns: "extract" | "brief" | "summarize" | "explain"
     """
-    q = (question or "").lower()
+    return infer_answer_mode_lc(prep_question(question))
 
-    # Extract mode: user wants a specific value
-    extract_kws = ["what is the", "what's the", "what are the", "how much", "how many", "percentage", "number of"]
-    if any(kw in q for kw in extract_kws):
-        return "extract"
-
-    # Brief mode: yes/no or short answer
-    brief_kws = ["is there", "do we have", "does it", "can we", "is it possible", "are there"]
-    if any(kw in q for kw in brief_kws):
-        return "brief"
-
-    # Summarize mode: user wants an overview
-    summarize_kws = ["summarize", "summary", "overview", "list", "outline", "key points"]
-    if any(kw in q for kw in summarize_kws):
-        return "summarize"
 
+def infer_answer_mode_lc(q: str) -> str:
+    """``infer_answer_mode`` for an already ``prep_question``-ed string."""
     # Default: explain
-    return "explain"
+    return _ANSWER_MODE_CLASSIFIER.classify(q) or "explain"
@@ -13,14 +13,36 @@ Usage:
 
 from __future__ import annotations
 
+import asyncio
 import functools
+import itertools
+import logging
 import time
 from typing import Any, Callable
 
+from app.core.config import settings
 from app.utils.logging import get_logger
 
 logger = get_logger("askmojo.timing")
 
+# Shared across all spans; next() on itertools.count is atomic under the GIL
+_span_counter = itertools.count()
+
+
+def _log_elapsed(label: str, elapsed_s: float) -> None:
+    """
+    Log a completed span (shared by Timer and the @timed wrappers).
+
+    A disabled INFO level costs one bool check; otherwise only every
+    ``settings.timing_log_sample_every``-th span is logged.
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    sample_every = settings.timing_log_sample_every
+    if sample_every > 1 and next(_span_counter) % sample_every:
+        return
+    logger.info("%s completed in %.1fms", label, elapsed_s * 1000)
+
 
 class Timer:
     """Simple context-manager timer (sync + async compatible)."""
@@ -42,9 +64,7 @@ class Timer:
     def __exit__(self, *_: Any) -> None:
         self.elapsed_s = time.perf_counter() - self._start
         if self.label:
-            logger.info(
-                "%s completed in %.1fms", self.label, self.elapsed_ms
-            )
+            _log_elapsed(self.label, self.elapsed_s)
 
     # Async
     async def __aenter__(self) -> "Timer":
@@ -54,9 +74,7 @@ class Timer:
     async def __aexit__(self, *_: Any) -> None:
         self.elapsed_s = time.perf_counter() - self._start
         if self.label:
-            logger.info(
-                "%s completed in %.1fms", self.label, self.elapsed_ms
-            )
+            _log_elapsed(self.label, self.elapsed_s)
 
 
 def timed(label: str | None = None) -> Callable:
@@ -68,27 +86,27 @@ def timed(label: str | None = None) -> Callable:
     def decorator(fn: Callable) -> Callable:
         _label = label or fn.__qualname__
 
-        if _is_coroutine_function(fn):
+        # Decided once at decoration time, not per call
+        if asyncio.iscoroutinefunction(fn):
 
             @functools.wraps(fn)
             async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
-                async with Timer(_label):
+                start = time.perf_counter()
+                try:
                     return await fn(*args, **kwargs)
+                finally:
+                    _log_elapsed(_label, time.perf_counter() - start)
 
             return async_wrapper
 
         @functools.wraps(fn)
         def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
-            with Timer(_label):
+            start = time.perf_counter()
+            try:
                 return fn(*args, **kwargs)
+            finally:
+                _log_elapsed(_label, time.perf_counter() - start)
 
         return sync_wrapper
 
     return decorator
-
-
-def _is_coroutine_function(fn: Callable) -> bool:
-    """Check if a callable is an async function."""
-    import asyncio
-
-    return asyncio.iscoroutinefunction(fn)
@@ -1,126 +1,40 @@
 """
 Generate document descriptions using OpenAI API based on document content.
 """
+import asyncio
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import os
 import pdfplumber
+import pypdfium2 as pdfium
 from pathlib import Path
-from openai import OpenAI
+from typing import Iterable, Iterator
+from openai import AsyncOpenAI, OpenAI
 from app.core.config import settings
+from app.services.llm import get_openai_client, truncate_to_tokens
+from app.vector_logic.chunking import PDFIUM_LOCK, _page_text
+from app.utils.logging import get_logger
 
+logger = get_logger("askmojo.vector_logic.description")
 
-def extract_text_from_pdf(file_path: str, max_chars: int = None) -> str:
-    """
-    Extract text from PDF file (full document for description generation).
-    
-    Args:
-        file_path: Path to PDF file
-        max_chars: Maximum characters to extract (None = extract all, for API token limits)
-    
-    Returns:
-        Extracted text content (full PDF or truncated if max_chars specified)
-    """
-    text_content = []
-    total_chars = 0
-    
-    try:
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    # If max_chars is None, extract all pages
-                    if max_chars is None:
-                        text_content.append(page_text)
-                    else:
-                        # If max_chars is specified, respect the limit
-                        if total_chars + len(page_text) > max_chars:
-                            # Add partial text to reach max_chars
-                            remaining = max_chars - total_chars
-                            text_content.append(page_text[:remaining])
-                            break
-                        text_content.append(page_text)
-                        total_chars += len(page_text)
-    except Exception as e:
-        print(f"Error extracting text from PDF: {str(e)}")
-        return ""
-    
-    return "\n\n".join(text_content)
 
+# Bump whenever the description prompt/model changes so cached descriptions
+# produced by the old prompt are regenerated instead of reused.
+DESCRIPTION_PROMPT_VERSION = 3
+DESCRIPTION_MODEL = "gpt-4o-mini"
 
-def generate_description(
-    title: str,
-    category: str | None,
-    file_path: str,
-    openai_api_key: str | None = None,
-    domain: str | None = None
-) -> tuple[str, dict | None]:
-    """
-    Generate document description using OpenAI API.
-    
-    Args:
-        title: Document title
-        category: Document category
-        file_path: Path to the document file
-        openai_api_key: OpenAI API key (if None, uses settings)
-    
-    Returns:
-        Generated description
-    """
-    if not openai_api_key:
-        openai_api_key = getattr(settings, 'openai_api_key', None)
-    
-    if not openai_api_key:
-        print("Warning: OpenAI API key not configured. Returning default description.")
-        fallback_description = f"Document: {title}" + (f" (Category: {category})" if category else "")
-        return fallback_description, None
-    
-    try:
-        # Extract text from document (full PDF)
-        file_ext = Path(file_path).suffix.lower()
-        
-        if file_ext == '.pdf':
-            # Extract full PDF content
-            document_content = extract_text_from_pdf(file_path, max_chars=None)
-        else:
-            # For other file types, you can add extraction logic here
-            document_content = f"Document title: {title}"
-        
-        # Check content length and handle token limits intelligently
-        # OpenAI has token limits, so we may need to truncate if too long
-        # GPT-4o-mini context window is 128k tokens, but we want to leave room for response
-        # Roughly 1 token = 4 characters, so 100k tokens = ~400k characters
-        # We'll use a safe limit of 300k characters to leave room for prompt and response
-        max_content_chars = 300000  # ~75k tokens for content
-        
-        if len(document_content) > max_content_chars:
-            print(f"Document content is very long ({len(document_content)} chars). Truncating to {max_content_chars} chars for description generation.")
-            document_content = document_content[:max_content_chars] + "\n\n[Content truncated for description generation...]"
-        
-        # Prepare prompt for OpenAI
-        domain_lower = (domain or '').lower()
-        domain_instructions = ""
-        if domain_lower:
-            if any(k in domain_lower for k in ["proposal", "proposals"]):
-                domain_instructions = "Prioritize client, scope, deliverables, approach, milestones, pricing cues, and acceptance criteria."
-            elif any(k in domain_lower for k in ["policy", "policies", "strategy"]):
-                domain_instructions = "Prioritize rules, enforcement, compliance frameworks (e.g., ISO/SOC2), scope/coverage, exceptions, and definitions."
-            elif any(k in domain_lower for k in ["icp", "profiles"]):
-                domain_instructions = "Prioritize personas, pain points, buying triggers, evaluation criteria, objections, and messaging hooks."
-            elif any(k in domain_lower for k in ["devops", "platform", "cloud"]):
-                domain_instructions = "Prioritize cloud platforms, CI/CD, IaC, reliability, security controls, observability, and deployment strategies."
-            elif any(k in domain_lower for k in ["qa", "testing", "quality"]):
-                domain_instructions = "Prioritize test strategy, automation tooling, coverage, flaky detection, environments, and reporting."
-            elif any(k in domain_lower for k in ["security", "infosec"]):
-                domain_instructions = "Prioritize security controls, threat models, cert management, secrets, compliance, and mitigations."
-        if domain_instructions:
-            domain_instructions = f"\n\nDOMAIN FOCUS ({domain}): {domain_instructions}"
-        prompt = f"""You are extracting structured metadata to help an AI router select this document correctly.
-
-=== DOCUMENT INFO ===
-Title: {title}
-Category: {category or 'General'}
-    Domain: {domain or 'Unspecified'}{domain_instructions}
-
-=== DOCUMENT CONTENT ===
-{document_content}
+# Static prompt instructions. OpenAI caches prompt prefixes automatically
+# (exact byte match, 1024+ tokens), so these go first, verbatim, and all
+# per-document values (title, domain, content) are appended after them.
+# The long extraction specs are sent as the system message, so the whole
+# cacheable prefix sits in one canonical block ahead of the user message.
+_DESCRIPTION_EXTRACTION_SPEC = """You are a helpful assistant that generates clear, searchable document descriptions for a knowledge base system. Analyze the full document content provided and create comprehensive descriptions.
+
+You are extracting structured metadata to help an AI router select this document correctly.
+The user message contains the document info and full content.
 
 === EXTRACT IN THIS EXACT FORMAT ===
 
@@ -177,45 +91,595 @@ KEYWORDS: [Industry terms, methodologies, standards for semantic search - 15-20
 5. **ENUMERATED_SCOPE is CRITICAL** - If you see ANY bulleted list in the document, you MUST copy EVERY item. Never summarize lists.
 6. For questions like "What are the critical transaction journeys?", the answer must be findable in ENUMERATED_SCOPE
 7. KEY_ENTITIES should include specific flows, processes, features (e.g., "Full swipe", "Instant cashback", "No-cost EMI")
-8. Keep each section structured for parsing"""  
+8. Keep each section structured for parsing"""
 
-        # Call OpenAI API
-        client = OpenAI(api_key=openai_api_key)
-        
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # Using mini for cost efficiency, can be changed to gpt-4
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful assistant that generates clear, searchable document descriptions for a knowledge base system. Analyze the full document content provided and create comprehensive descriptions."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            max_tokens=2500,  # Increased for ENUMERATED_SCOPE extraction
-            temperature=0.3  # Lower for consistent extraction
+_REFINE_PROMPT_PREFIX = """Refine and improve the following document description to make it more searchable and informative.
+
+Please provide an improved description that:
+1. Is more concise and clear
+2. Better captures key searchable terms
+3. Highlights when this document would be most useful
+4. Includes relevant metadata for better search results"""
+
+_CATEGORY_EXTRACTION_SPEC = """You are a precise metadata extractor. Output ONLY the structured format. No explanations.
+
+You are extracting metadata to help an AI router select the correct document collection.
+The user message contains the category and its document summaries.
+
+=== EXAMPLE ===
+INPUT: 
+- Doc1: Test automation framework audit, flaky test detection
+- Doc2: Selenium/Cypress automation setup
+
+OUTPUT:
+SUMMARY: Test automation proposals covering framework audits and tooling.
+TOOLS: Selenium, Cypress, pytest, Appium, BrowserStack, Jenkins
+SCOPE: automation audit, framework design, test coverage analysis, flaky test detection
+ENUMERATED_ITEMS:
+- Selenium WebDriver setup
+- Cypress E2E testing
+- pytest fixtures
+- Flaky test detection
+- Test coverage reporting
+CLIENTS: Dimagi
+KEYWORDS: QA, regression testing, test automation, framework optimization
+SYNONYMS: test automation, QA automation, framework audit, automation audit
+
+=== OUTPUT (exact format) ===
+SUMMARY: [What this category contains - 2 sentences max]
+PRIMARY_ENTITIES: [Company names, project names, client names - used for hard routing]
+DOCUMENT_TYPES: [Proposal, Report, Audit, SOW, Technical Spec - helps match intent]
+TOOLS: [ALL tools/platforms across ALL documents - exhaustive comma-separated list]
+SCOPE: [Main deliverables and capabilities - what problems these docs solve]
+
+ENUMERATED_ITEMS:
+[CRITICAL: Extract EVERY bullet point, list item, feature, flow, journey mentioned in any document]
+- [Item 1 - exact term from documents]
+- [Item 2 - exact term from documents]
+- [Continue for ALL items - this is essential for "What are the..." questions]
+
+KEY_ENTITIES:
+[Specific searchable terms: flows, transactions, processes, features]
+- [Entity 1 - e.g., "EMI flows", "DR failover", "cashback transactions"]
+- [Entity 2]
+
+KEYWORDS: [Industry terms for semantic search - 15-20 terms]
+SYNONYMS: [Alternative phrases users might use - include abbreviations and variations]
+
+CONTAINS_LISTS: [true/false - Does this category have documents with scope lists, feature lists, bullet points?]
+LIST_TOPICS: [Topics that have enumerable content, e.g., "transaction journeys, tools, testing phases"]
+HAS_SCOPE_SECTIONS: [true/false - Do documents have explicit Scope/Coverage/Includes sections?]
+
+QUESTION_PATTERNS:
+- Extract questions: "What are the...", "List the...", "Which ... are included"
+- Yes/No questions: "Does ... include...", "Is ... part of..."
+- Explain questions: "How does...", "What is the approach for..."
+
+CRITICAL RULES:
+1. Extract EVERY tool from ALL documents (missing = routing failure)
+2. PRIMARY_ENTITIES must list ALL company/client names exactly as written
+3. **ENUMERATED_ITEMS is CRITICAL** - Extract EVERY list item from documents verbatim
+4. For "What are the transaction journeys?" the answer MUST be in ENUMERATED_ITEMS
+5. KEY_ENTITIES should include specific flows, processes, features (e.g., "Full swipe", "Instant cashback")
+6. CONTAINS_LISTS must be accurate - this affects answer extraction
+7. If unsure, set CONTAINS_LISTS: true (better to over-search than miss)"""
+
+
+# Domain-specific focus lines, checked in order against the lowercased domain
+# name: (keywords, description-prompt instructions, category-prompt intro).
+# One row per bucket keeps the two prompts' domain handling in sync.
+_DOMAIN_FOCUS = (
+    (
+        ("proposal", "proposals"),
+        "Prioritize client, scope, deliverables, approach, milestones, pricing cues, and acceptance criteria.",
+        "Focus on client, scope, deliverables, approach, and milestones.",
+    ),
+    (
+        ("policy", "policies", "strategy"),
+        "Prioritize rules, enforcement, compliance frameworks (e.g., ISO/SOC2), scope/coverage, exceptions, and definitions.",
+        "Focus on rules, enforcement, compliance, scope/coverage, and exceptions.",
+    ),
+    (
+        ("icp", "profiles"),
+        "Prioritize personas, pain points, buying triggers, evaluation criteria, objections, and messaging hooks.",
+        "Focus on personas, pain points, decision criteria, and messaging.",
+    ),
+    (
+        ("devops", "platform", "cloud"),
+        "Prioritize cloud platforms, CI/CD, IaC, reliability, security controls, observability, and deployment strategies.",
+        "Focus on CI/CD, cloud/IaC, reliability, security, and observability.",
+    ),
+    (
+        ("qa", "testing", "quality"),
+        "Prioritize test strategy, automation tooling, coverage, flaky detection, environments, and reporting.",
+        "Focus on test tooling, coverage, flakiness, environments, and reporting.",
+    ),
+    (
+        ("security", "infosec"),
+        "Prioritize security controls, threat models, cert management, secrets, compliance, and mitigations.",
+        "Focus on controls, certs/secrets, threat modeling, and compliance.",
+    ),
+)
+
+
+def _domain_focus(domain: str | None) -> tuple[str, str]:
+    """Return (description instructions, category intro) for a domain, or empty strings."""
+    domain_lower = (domain or "").lower()
+    if domain_lower:
+        for keywords, instructions, intro in _DOMAIN_FOCUS:
+            if any(k in domain_lower for k in keywords):
+                return instructions, intro
+    return "", ""
+
+
+@functools.lru_cache(maxsize=4)
+def _get_client(api_key: str) -> OpenAI:
+    """
+    Reuse one OpenAI client (and its HTTP connection pool) per API key instead
+    of paying a new TLS handshake per call. The configured key shares the
+    app-wide singleton.
+    """
+    if api_key == settings.openai_api_key:
+        return get_openai_client()
+    return OpenAI(api_key=api_key)
+
+
+def _usage_info(response, call: str) -> dict | None:
+    """
+    Token usage for a chat completion, including how many prompt tokens
+    OpenAI served from its prompt cache. Logs one line per call so the
+    cache hit rate can be tracked over time.
+    """
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = (getattr(details, "cached_tokens", None) or 0) if details else 0
+    prompt_tokens = usage.prompt_tokens or 0
+    usage_info = {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "total_tokens": usage.total_tokens,
+        "cached_tokens": cached_tokens,
+        "cache_hit_ratio": cached_tokens / max(prompt_tokens, 1),
+    }
+    logger.info(
+        "[OPENAI] %s usage: prompt=%d cached=%d (%.0f%%) completion=%d",
+        call, prompt_tokens, cached_tokens,
+        usage_info["cache_hit_ratio"] * 100, usage.completion_tokens or 0,
+    )
+    return usage_info
+
+
+_DESCRIPTION_CACHE_DIR = Path(__file__).resolve().parents[1] / "description_cache"  # app/description_cache
+
+
+def _description_cache_key(
+    file_path: str,
+    title: str,
+    category: str | None,
+    domain: str | None
+) -> str | None:
+    """
+    Key a generated description by file content plus every prompt input, so a
+    re-upload of the same bytes with the same metadata reuses the description.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    try:
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    digest.update(json.dumps(
+        [DESCRIPTION_PROMPT_VERSION, DESCRIPTION_MODEL, title, category, domain]
+    ).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _category_cache_key(category_name: str, document_summaries: str, domain: str | None) -> str:
+    """
+    Key a category description by its prompt inputs; regenerating a category
+    whose document summaries have not changed reuses the stored description.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(json.dumps(
+        ["category", DESCRIPTION_PROMPT_VERSION, DESCRIPTION_MODEL, category_name, domain, document_summaries]
+    ).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _load_cached_description(key: str) -> str | None:
+    """Return a previously generated description for this key, if any."""
+    try:
+        with open(_DESCRIPTION_CACHE_DIR / f"{key}.json", encoding="utf-8") as f:
+            return json.load(f).get("description")
+    except (OSError, ValueError):
+        return None
+
+
+def _store_cached_description(key: str, description: str, usage_info: dict | None) -> None:
+    """Persist a generated description (best effort; failures only skip caching)."""
+    try:
+        _DESCRIPTION_CACHE_DIR.mkdir(exist_ok=True)
+        with open(_DESCRIPTION_CACHE_DIR / f"{key}.json", "w", encoding="utf-8") as f:
+            json.dump({"description": description, "usage_info": usage_info}, f, ensure_ascii=False)
+    except OSError:
+        logger.warning("Could not cache generated description", exc_info=True)
+
+
+def _join_page_texts(page_texts: Iterable[str], max_chars: int | None) -> str:
+    """
+    Join page texts with blank lines, consuming pages lazily and stopping as
+    soon as ``max_chars`` is reached (later pages are never parsed). The
+    limit covers the separators too, so the result never exceeds it.
+    """
+    buffer = io.StringIO()
+    remaining = max_chars
+    separator = ""
+    for page_text in page_texts:
+        if not page_text:
+            continue
+        piece = separator + page_text
+        separator = "\n\n"
+        # If max_chars is None, extract all pages
+        if remaining is None:
+            buffer.write(piece)
+            continue
+        # If max_chars is specified, write up to the limit and stop
+        buffer.write(piece[:remaining])
+        remaining -= len(piece)
+        if remaining <= 0:
+            break
+    return buffer.getvalue()
+
+
+def _iter_pdfium_page_texts(file_path: str) -> Iterator[str]:
+    """Yield each page's text using PDFium (native, far faster than pdfplumber)."""
+    pdf = pdfium.PdfDocument(file_path)
+    try:
+        for index in range(len(pdf)):
+            yield _page_text(pdf, index)
+    finally:
+        pdf.close()
+
+
+def _iter_pdfplumber_page_texts(file_path: str) -> Iterator[str]:
+    """Yield each page's text using pdfplumber (fallback for PDFs PDFium rejects)."""
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages:
+            yield page.extract_text()
+            # Release the page's cached layout objects (we only keep its text)
+            page.flush_cache()
+
+
+# Fingerprints of PDFs that yielded no text (scanned images, corrupt files),
+# so re-uploads/reindexes skip parsing them again in this process
+_EMPTY_PDF_FINGERPRINTS: set[str] = set()
+
+
+def _pdf_fingerprint(file_path: str) -> str | None:
+    """Cheap file identity: hash of the first 64 KiB plus the file size."""
+    try:
+        with open(file_path, "rb") as f:
+            head = f.read(1 << 16)
+            size = os.fstat(f.fileno()).st_size
+    except OSError:
+        return None
+    return hashlib.blake2b(head + size.to_bytes(8, "little"), digest_size=16).hexdigest()
+
+
+def extract_text_from_pdf(file_path: str, max_chars: int = None) -> str:
+    """
+    Extract text from PDF file (full document for description generation).
+    
+    Args:
+        file_path: Path to PDF file
+        max_chars: Maximum characters to extract (None = extract all, for API token limits)
+    
+    Returns:
+        Extracted text content (full PDF or truncated if max_chars specified)
+    """
+    fingerprint = _pdf_fingerprint(file_path)
+    if fingerprint is None:
+        logger.error("Error extracting text from PDF %s: file cannot be read", file_path)
+        return ""
+    if fingerprint in _EMPTY_PDF_FINGERPRINTS:
+        logger.info("Skipping PDF with no extractable text: %s", file_path)
+        return ""
+    
+    text = _extract_text_from_pdf(file_path, max_chars)
+    if not text:
+        _EMPTY_PDF_FINGERPRINTS.add(fingerprint)
+    return text
+
+
+def _extract_text_from_pdf(file_path: str, max_chars: int | None) -> str:
+    """PDFium extraction with a pdfplumber fallback; "" if neither yields text."""
+    try:
+        # closing() releases the document before the lock when we stop early
+        with PDFIUM_LOCK, contextlib.closing(_iter_pdfium_page_texts(file_path)) as page_texts:
+            return _join_page_texts(page_texts, max_chars)
+    except Exception as e:
+        logger.warning("PDFium could not read %s (%s); falling back to pdfplumber", file_path, e)
+    
+    try:
+        return _join_page_texts(_iter_pdfplumber_page_texts(file_path), max_chars)
+    except Exception:
+        logger.exception("Error extracting text from PDF %s", file_path)
+        return ""
+
+
+def _lookup_cached_description(
+    title: str,
+    category: str | None,
+    file_path: str,
+    domain: str | None
+) -> tuple[str | None, str | None]:
+    """Return (cache key, cached description) for a document; either may be None."""
+    if not settings.description_cache_enabled:
+        return None, None
+    cache_key = _description_cache_key(file_path, title, category, domain)
+    cached_description = _load_cached_description(cache_key) if cache_key else None
+    if cached_description:
+        logger.info("Using cached description for document: %s", title)
+    return cache_key, cached_description
+
+
+def _fallback_description(title: str, category: str | None, domain: str | None = None) -> str:
+    """Minimal description used when OpenAI is unavailable or fails."""
+    return f"Document: {title}" + (f" (Category: {category})" if category else "") + (f" [Domain: {domain}]" if domain else "")
+
+
+@functools.lru_cache(maxsize=16)
+def _pdf_description_content(file_path: str, mtime_ns: int, size: int) -> str:
+    """
+    Extract and budget a PDF's text for the description prompt. Pure for a
+    given file version, so it is cached by (path, mtime, size): regenerating
+    with a different title/category/domain reuses the extracted text.
+    """
+    # Check content length and handle token limits intelligently
+    # GPT-4o-mini context window is 128k tokens, but we want to leave room for
+    # the extraction spec and the response, so content gets a fixed token budget.
+    # Extraction stops at a character cap first (PDF text rarely packs more
+    # than 4 chars/token, so the cap never cuts below the token budget).
+    max_content_tokens = 75000
+    max_content_chars = 300000  # Parse no more than this; ~4 chars per token
+    
+    document_content = extract_text_from_pdf(file_path, max_chars=max_content_chars)
+    document_content, truncated = truncate_to_tokens(document_content, max_content_tokens)
+    if truncated or len(document_content) >= max_content_chars:
+        logger.info(
+            "Document content is very long. Truncated to %d tokens / %d chars for description generation.",
+            max_content_tokens, len(document_content),
         )
-        
-        description = response.choices[0].message.content.strip()
-        
-        # Extract token usage information
-        usage_info = None
-        if hasattr(response, 'usage'):
-            usage_info = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens
+        document_content += "\n\n[Content truncated for description generation...]"
+    return document_content
+
+
+def _description_prompt(
+    title: str,
+    category: str | None,
+    domain: str | None,
+    document_content: str
+) -> str:
+    """Assemble the per-document user message (the static spec is the system message)."""
+    domain_instructions, _ = _domain_focus(domain)
+    if domain_instructions:
+        domain_instructions = f"\n\nDOMAIN FOCUS ({domain}): {domain_instructions}"
+    return (
+        "=== DOCUMENT INFO ===\n"
+        f"Title: {title}\n"
+        f"Category: {category or 'General'}\n"
+        f"Domain: {domain or 'Unspecified'}{domain_instructions}\n\n"
+        "=== DOCUMENT CONTENT ===\n"
+        f"{document_content}"
+    )
+
+
+def _build_description_prompt(
+    title: str,
+    category: str | None,
+    file_path: str,
+    domain: str | None
+) -> str:
+    """Extract the document text and assemble the description prompt."""
+    if Path(file_path).suffix.lower() == '.pdf':
+        stat = os.stat(file_path)
+        document_content = _pdf_description_content(file_path, stat.st_mtime_ns, stat.st_size)
+    else:
+        # For other file types, you can add extraction logic here
+        document_content = f"Document title: {title}"
+    
+    return _description_prompt(title, category, domain, document_content)
+
+
+def _description_request(prompt: str) -> dict:
+    """Chat completion arguments for a description prompt (shared by sync/async)."""
+    return {
+        "model": DESCRIPTION_MODEL,  # Using mini for cost efficiency, can be changed to gpt-4
+        "messages": [
+            {
+                "role": "system",
+                "content": _DESCRIPTION_EXTRACTION_SPEC
+            },
+            {
+                "role": "user",
+                "content": prompt
             }
+        ],
+        "max_tokens": 2500,  # Increased for ENUMERATED_SCOPE extraction
+        "temperature": 0.3  # Lower for consistent extraction
+    }
+
+
+def _finish_description(response, cache_key: str | None) -> tuple[str, dict | None]:
+    """Pull the description and token usage out of a response and cache them."""
+    description = response.choices[0].message.content.strip()
+    
+    # Extract token usage information (including prompt-cache hits)
+    usage_info = _usage_info(response, "generate_description")
+    
+    if cache_key:
+        _store_cached_description(cache_key, description, usage_info)
+    
+    return description, usage_info
+
+
+def generate_description(
+    title: str,
+    category: str | None,
+    file_path: str,
+    openai_api_key: str | None = None,
+    domain: str | None = None
+) -> tuple[str, dict | None]:
+    """
+    Generate document description using OpenAI API.
+    
+    Args:
+        title: Document title
+        category: Document category
+        file_path: Path to the document file
+        openai_api_key: OpenAI API key (if None, uses settings)
+    
+    Returns:
+        Generated description (usage info is None when served from the cache)
+    """
+    cache_key, cached_description = _lookup_cached_description(title, category, file_path, domain)
+    if cached_description:
+        return cached_description, None
+    
+    if not openai_api_key:
+        openai_api_key = getattr(settings, 'openai_api_key', None)
+    
+    if not openai_api_key:
+        logger.warning("OpenAI API key not configured. Returning default description.")
+        return _fallback_description(title, category), None
+    
+    try:
+        prompt = _build_description_prompt(title, category, file_path, domain)
+
+        # Call OpenAI API
+        client = _get_client(openai_api_key)
+        response = client.chat.completions.create(**_description_request(prompt))
+        return _finish_description(response, cache_key)
         
-        return description, usage_info
+    except Exception:
+        logger.exception("Error generating description with OpenAI for %r", title)
+        return _fallback_description(title, category, domain), None
+
+
+async def generate_description_async(
+    title: str,
+    category: str | None,
+    file_path: str,
+    openai_api_key: str | None = None,
+    domain: str | None = None,
+    client: AsyncOpenAI | None = None
+) -> tuple[str, dict | None]:
+    """
+    Async variant of generate_description. File hashing and PDF extraction
+    run in a worker thread; the OpenAI call is awaited, so many documents
+    can be described concurrently (see generate_descriptions_bulk).
+    """
+    cache_key, cached_description = await asyncio.to_thread(
+        _lookup_cached_description, title, category, file_path, domain
+    )
+    if cached_description:
+        return cached_description, None
+    
+    if not openai_api_key:
+        openai_api_key = getattr(settings, 'openai_api_key', None)
+    
+    if not openai_api_key:
+        logger.warning("OpenAI API key not configured. Returning default description.")
+        return _fallback_description(title, category), None
+    
+    try:
+        prompt = await asyncio.to_thread(_build_description_prompt, title, category, file_path, domain)
+        if client is None:
+            async with AsyncOpenAI(api_key=openai_api_key) as own_client:
+                response = await own_client.chat.completions.create(**_description_request(prompt))
+        else:
+            response = await client.chat.completions.create(**_description_request(prompt))
+        return await asyncio.to_thread(_finish_description, response, cache_key)
         
-    except Exception as e:
-        print(f"Error generating description with OpenAI: {str(e)}")
-        # Fallback description
-        fallback_description = f"Document: {title}" + (f" (Category: {category})" if category else "") + (f" [Domain: {domain}]" if domain else "")
-        return fallback_description, None
+    except Exception:
+        logger.exception("Error generating description with OpenAI for %r", title)
+        return _fallback_description(title, category, domain), None
+
+
+async def generate_descriptions_bulk(
+    items: Iterable[dict],
+    max_concurrency: int = 8,
+    openai_api_key: str | None = None,
+    max_parsers: int = 2
+) -> list[tuple[str, dict | None]]:
+    """
+    Describe many documents as a two-stage pipeline: ``max_parsers``
+    producers hash files and extract PDF text (in threads) into a bounded
+    queue, while ``max_concurrency`` consumers drain it with OpenAI calls.
+    Parsing of later documents overlaps the network wait of earlier ones.
+
+    Each item holds generate_description's keyword arguments (title,
+    category, file_path, optional domain). Results are in input order.
+    """
+    items = list(items)
+    results: list[tuple[str, dict | None] | None] = [None] * len(items)
+    openai_api_key = openai_api_key or getattr(settings, 'openai_api_key', None)
+    if not openai_api_key:
+        logger.warning("OpenAI API key not configured. Returning default descriptions.")
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2 * max_concurrency)
+    pending = iter(range(len(items)))  # Shared by all producers
+    
+    async def produce() -> None:
+        for index in pending:
+            item = items[index]
+            title, category, domain = item["title"], item.get("category"), item.get("domain")
+            try:
+                cache_key, cached_description = await asyncio.to_thread(
+                    _lookup_cached_description, title, category, item["file_path"], domain
+                )
+                if cached_description:
+                    results[index] = (cached_description, None)
+                elif not openai_api_key:
+                    results[index] = (_fallback_description(title, category), None)
+                else:
+                    prompt = await asyncio.to_thread(
+                        _build_description_prompt, title, category, item["file_path"], domain
+                    )
+                    await queue.put((index, cache_key, prompt))
+            except Exception:
+                logger.exception("Error preparing description for %r", title)
+                results[index] = (_fallback_description(title, category, domain), None)
+    
+    async def consume(client: AsyncOpenAI) -> None:
+        while (job := await queue.get()) is not None:
+            index, cache_key, prompt = job
+            item = items[index]
+            try:
+                response = await client.chat.completions.create(**_description_request(prompt))
+                results[index] = await asyncio.to_thread(_finish_description, response, cache_key)
+            except Exception:
+                logger.exception("Error generating description with OpenAI for %r", item["title"])
+                results[index] = (_fallback_description(item["title"], item.get("category"), item.get("domain")), None)
+    
+    if not openai_api_key:
+        await asyncio.gather(*(produce() for _ in range(max_parsers)))
+        return results
+    
+    # One client (and connection pool) shared by every request in the batch
+    async with AsyncOpenAI(api_key=openai_api_key) as client:
+        consumers = [asyncio.create_task(consume(client)) for _ in range(max_concurrency)]
+        try:
+            await asyncio.gather(*(produce() for _ in range(max_parsers)))
+            for _ in consumers:
+                await queue.put(None)
+            await asyncio.gather(*consumers)
+        finally:
+            for task in consumers:
+                task.cancel()
+    return results
 
 
 def refine_description(
@@ -245,23 +709,18 @@ def refine_description(
         return current_description
     
     try:
-        prompt = f"""Refine and improve the following document description to make it more searchable and informative.
-
-Document Title: {title}
-Category: {category or 'Uncategorized'}
-    Domain: {domain or 'Unspecified'}
-Current Description: {current_description}
-
-Please provide an improved description that:
-1. Is more concise and clear
-2. Better captures key searchable terms
-3. Highlights when this document would be most useful
-4. Includes relevant metadata for better search results"""
+        prompt = (
+            f"{_REFINE_PROMPT_PREFIX}\n\n"
+            f"Document Title: {title}\n"
+            f"Category: {category or 'Uncategorized'}\n"
+            f"Domain: {domain or 'Unspecified'}\n"
+            f"Current Description: {current_description}"
+        )
 
-        client = OpenAI(api_key=openai_api_key)
+        client = _get_client(openai_api_key)
         
         response = client.chat.completions.create(
-            model="gpt-4o-mini",
+            model=DESCRIPTION_MODEL,
             messages=[
                 {
                     "role": "system",
@@ -277,10 +736,11 @@ Please provide an improved description that:
         )
         
         refined_description = response.choices[0].message.content.strip()
+        _usage_info(response, "refine_description")
         return refined_description
         
-    except Exception as e:
-        print(f"Error refining description: {str(e)}")
+    except Exception:
+        logger.exception("Error refining description for %r", title)
         return current_description
 
 
@@ -307,111 +767,44 @@ def generate_category_description(
     Returns:
         Generated category description string
     """
+    cache_key = None
+    if settings.description_cache_enabled:
+        cache_key = _category_cache_key(category_name, document_summaries, domain)
+        cached_description = _load_cached_description(cache_key)
+        if cached_description:
+            return cached_description
+    
     # Get API key from settings if not provided
     if not openai_api_key:
         openai_api_key = getattr(settings, 'openai_api_key', None)
     
     # Fallback if no API key available
     if not openai_api_key:
-        print("[WARNING] No OpenAI API key available for category description generation")
+        logger.warning("No OpenAI API key available for category description generation")
         return f"Category: {category_name}"
     
     try:
-        # Few-Shot + Structured Output Prompt (Optimized for search)
-               # Optimized prompt for routing-aware category descriptions
-              # Optimized prompt for routing-aware category descriptions
-        domain_lower = (domain or '').lower()
-        domain_intro = ""
-        if domain_lower:
-            if any(k in domain_lower for k in ["proposal", "proposals"]):
-                domain_intro = "Focus on client, scope, deliverables, approach, and milestones."
-            elif any(k in domain_lower for k in ["policy", "policies", "strategy"]):
-                domain_intro = "Focus on rules, enforcement, compliance, scope/coverage, and exceptions."
-            elif any(k in domain_lower for k in ["icp", "profiles"]):
-                domain_intro = "Focus on personas, pain points, decision criteria, and messaging."
-            elif any(k in domain_lower for k in ["devops", "platform", "cloud"]):
-                domain_intro = "Focus on CI/CD, cloud/IaC, reliability, security, and observability."
-            elif any(k in domain_lower for k in ["qa", "testing", "quality"]):
-                domain_intro = "Focus on test tooling, coverage, flakiness, environments, and reporting."
-            elif any(k in domain_lower for k in ["security", "infosec"]):
-                domain_intro = "Focus on controls, certs/secrets, threat modeling, and compliance."
-        domain_block = f"\n\nDOMAIN: {domain} — {domain_intro}" if domain_intro else (f"\n\nDOMAIN: {domain}" if domain else "")
-
-        prompt = f"""You are extracting metadata to help an AI router select the correct document collection.{domain_block}
-
-=== EXAMPLE ===
-INPUT: 
-- Doc1: Test automation framework audit, flaky test detection
-- Doc2: Selenium/Cypress automation setup
-
-OUTPUT:
-SUMMARY: Test automation proposals covering framework audits and tooling.
-TOOLS: Selenium, Cypress, pytest, Appium, BrowserStack, Jenkins
-SCOPE: automation audit, framework design, test coverage analysis, flaky test detection
-ENUMERATED_ITEMS:
-- Selenium WebDriver setup
-- Cypress E2E testing
-- pytest fixtures
-- Flaky test detection
-- Test coverage reporting
-CLIENTS: Dimagi
-KEYWORDS: QA, regression testing, test automation, framework optimization
-SYNONYMS: test automation, QA automation, framework audit, automation audit
-
-=== NOW EXTRACT ===
-Category: {category_name}
-
-Documents:
-{document_summaries}
-
-=== OUTPUT (exact format) ===
-SUMMARY: [What this category contains - 2 sentences max]
-PRIMARY_ENTITIES: [Company names, project names, client names - used for hard routing]
-DOCUMENT_TYPES: [Proposal, Report, Audit, SOW, Technical Spec - helps match intent]
-TOOLS: [ALL tools/platforms across ALL documents - exhaustive comma-separated list]
-SCOPE: [Main deliverables and capabilities - what problems these docs solve]
-
-ENUMERATED_ITEMS:
-[CRITICAL: Extract EVERY bullet point, list item, feature, flow, journey mentioned in any document]
-- [Item 1 - exact term from documents]
-- [Item 2 - exact term from documents]
-- [Continue for ALL items - this is essential for "What are the..." questions]
-
-KEY_ENTITIES:
-[Specific searchable terms: flows, transactions, processes, features]
-- [Entity 1 - e.g., "EMI flows", "DR failover", "cashback transactions"]
-- [Entity 2]
-
-KEYWORDS: [Industry terms for semantic search - 15-20 terms]
-SYNONYMS: [Alternative phrases users might use - include abbreviations and variations]
-
-CONTAINS_LISTS: [true/false - Does this category have documents with scope lists, feature lists, bullet points?]
-LIST_TOPICS: [Topics that have enumerable content, e.g., "transaction journeys, tools, testing phases"]
-HAS_SCOPE_SECTIONS: [true/false - Do documents have explicit Scope/Coverage/Includes sections?]
-
-QUESTION_PATTERNS:
-- Extract questions: "What are the...", "List the...", "Which ... are included"
-- Yes/No questions: "Does ... include...", "Is ... part of..."
-- Explain questions: "How does...", "What is the approach for..."
-
-CRITICAL RULES:
-1. Extract EVERY tool from ALL documents (missing = routing failure)
-2. PRIMARY_ENTITIES must list ALL company/client names exactly as written
-3. **ENUMERATED_ITEMS is CRITICAL** - Extract EVERY list item from documents verbatim
-4. For "What are the transaction journeys?" the answer MUST be in ENUMERATED_ITEMS
-5. KEY_ENTITIES should include specific flows, processes, features (e.g., "Full swipe", "Instant cashback")
-6. CONTAINS_LISTS must be accurate - this affects answer extraction
-7. If unsure, set CONTAINS_LISTS: true (better to over-search than miss)"""
+        # Few-Shot + Structured Output Prompt, optimized for routing-aware category descriptions
+        _, domain_intro = _domain_focus(domain)
+        domain_block = f"DOMAIN: {domain} — {domain_intro}\n\n" if domain_intro else (f"DOMAIN: {domain}\n\n" if domain else "")
+
+        prompt = (
+            f"{domain_block}"
+            "=== NOW EXTRACT ===\n"
+            f"Category: {category_name}\n\n"
+            "Documents:\n"
+            f"{document_summaries}"
+        )
 
         # Call OpenAI API
-        client = OpenAI(api_key=openai_api_key)
+        client = _get_client(openai_api_key)
         
         response = client.chat.completions.create(
-            model="gpt-4o-mini",  # Fast and cost-effective for structured extraction
+            model=DESCRIPTION_MODEL,  # Fast and cost-effective for structured extraction
             messages=[
                 {
                     "role": "system",
-                    "content": "You are a precise metadata extractor. Output ONLY the structured format. No explanations."
+                    "content": _CATEGORY_EXTRACTION_SPEC
                 },
                 {
                     "role": "user",
@@ -423,9 +816,12 @@ CRITICAL RULES:
         )
         
         generated_description = response.choices[0].message.content.strip()
-        print(f"[SUCCESS] Generated category description for '{category_name}'")
+        usage_info = _usage_info(response, "generate_category_description")
+        if cache_key:
+            _store_cached_description(cache_key, generated_description, usage_info)
+        logger.debug("Generated category description for %r", category_name)
         return generated_description
         
-    except Exception as e:
-        print(f"[ERROR] generate_category_description failed: {str(e)}")
+    except Exception:
+        logger.exception("generate_category_description failed for %r", category_name)
         return f"Category: {category_name}"
\ No newline at end of file
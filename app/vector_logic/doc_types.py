@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 from typing import Optional
 
 from sqlalchemy.orm import Session
@@ -7,6 +8,9 @@ from sqlalchemy.orm import Session
 from app.sqlite.models import Document, Category
 
 
+_LABEL_TRANS = str.maketrans("_-", "  ")
+
+
 def _normalize_label(value: Optional[str]) -> str:
     """
     Normalize a category / collection / legacy category string
@@ -14,13 +18,15 @@ def _normalize_label(value: Optional[str]) -> str:
     """
     if not value:
         return ""
-    return value.strip().lower().replace("_", " ").replace("-", " ")
+    return value.strip().lower().translate(_LABEL_TRANS)
 
 
+@functools.lru_cache(maxsize=1024)
 def infer_doc_type_from_category_name(name_or_collection: Optional[str]) -> str:
     """
     Map a Category.name or Category.collection_name to a normalized
-    document type used by the retrieval pipeline.
+    document type used by the retrieval pipeline. Category names are a
+    small closed set, so results are cached per name.
 
     Normalized types:
       - "proposal"
@@ -52,25 +58,23 @@ def infer_doc_type_from_category_name(name_or_collection: Optional[str]) -> str:
     return "other"
 
 
-def infer_doc_type_for_document(document: Document, db: Optional[Session] = None) -> str:
+@functools.lru_cache(maxsize=4096)
+def _infer_doc_type_from_title(title_and_file_name: str) -> Optional[str]:
     """
-    Infer the logical document type (proposal / case_study / solution / policy / other)
-    for a given Document using:
-      1. Its Category (name / collection_name) when available
-      2. Legacy document.category as a fallback
+    Doc type implied by a document's title + file name, or None if the
+    title is not specific. Cached: the same documents are typed on every
+    ingest/reindex and on every retrieval hit.
     """
-    # 1) Check Document Title / Filename first (more specific)
-    # This allows correctly identifying a "Case Study" inside a "Banking" category
-    label = _normalize_label(document.title + " " + (document.file_name or ""))
-    
+    label = _normalize_label(title_and_file_name)
+
     # Proposals
     if "proposal" in label:
         return "proposal"
-    
+
     # Case studies
     if ("case" in label and "study" in label) or "success story" in label:
         return "case_study"
-    
+
     # Solutions / Services
     if "solution" in label or "service" in label:
         return "solution"
@@ -79,6 +83,22 @@ def infer_doc_type_for_document(document: Document, db: Optional[Session] = None
     if "policy" in label or "policies" in label:
         return "policy"
 
+    return None
+
+
+def infer_doc_type_for_document(document: Document, db: Optional[Session] = None) -> str:
+    """
+    Infer the logical document type (proposal / case_study / solution / policy / other)
+    for a given Document using:
+      1. Its Category (name / collection_name) when available
+      2. Legacy document.category as a fallback
+    """
+    # 1) Check Document Title / Filename first (more specific)
+    # This allows correctly identifying a "Case Study" inside a "Banking" category
+    doc_type = _infer_doc_type_from_title(document.title + " " + (document.file_name or ""))
+    if doc_type is not None:
+        return doc_type
+
     # 2) Fallback to Category.name / collection_name
     if document.category_ref is not None:
         # Relationship already loaded
@@ -22,23 +22,113 @@ Attribute Types (HARD ROUTING):
 """
 from __future__ import annotations
 
+import functools
 import re
+import threading
+import time
+from collections import OrderedDict
 from enum import Enum
-from typing import Any
+from typing import Any, Callable
 
 from sqlalchemy import func, or_, and_
 from sqlalchemy.orm import Session
 
 from app.sqlite.models import Document, Category, Domain, CategoryDomain
+from app.utils.keywords import KeywordClassifier
+from app.utils.logging import get_logger
 
+# Handler loggers, created once (names unchanged from the per-call lookups)
+_LOG_DOMAIN_QUERY = get_logger("domain_query")
+_LOG_DOMAIN_LISTING = get_logger("domain_listing")
+_LOG_DOMAIN_EXISTENCE = get_logger("domain_existence")
 
+
+# Every ASCII character other than [a-z0-9] becomes a space (input is lowercased first)
+_REGISTRY_TRANS = str.maketrans({
+    chr(c): " " for c in range(128) if not ("a" <= chr(c) <= "z" or "0" <= chr(c) <= "9")
+})
+_RE_REGISTRY_NON_ALNUM = re.compile(r"[^a-z0-9\s]")
+
+
+@functools.lru_cache(maxsize=1024)
 def _normalize_registry_text(text: str) -> str:
-    """Normalize text for deterministic exact registry matching."""
+    """
+    Normalize text for deterministic exact registry matching.
+
+    Cached: the same question is normalized by several handlers (and the
+    domain resolver they share) while a single request is routed.
+    """
     t = (text or "").lower()
-    t = t.replace("_", " ").replace("-", " ")
-    t = re.sub(r"[^a-z0-9\s]", " ", t)
-    t = re.sub(r"\s+", " ", t).strip()
-    return t
+    if t.isascii():
+        # Common case: one translate pass instead of regex substitutions
+        t = t.translate(_REGISTRY_TRANS)
+    else:
+        t = _RE_REGISTRY_NON_ALNUM.sub(" ", t.replace("_", " "))
+    return " ".join(t.split())
+
+
+# Domain registry, refreshed after a TTL or when domains are edited. Holds
+# (loaded_at, version, {normalized name: id}, ((" name ", id), ...),
+#  ((id, name, description), ...) in id order).
+_DOMAIN_REGISTRY_TTL_S = 60.0
+_domain_registry_version = 0
+_domain_registry_cache: tuple[
+    float,
+    int,
+    dict[str, int],
+    tuple[tuple[str, int], ...],
+    tuple[tuple[int, str, str | None], ...],
+] | None = None
+
+
+def invalidate_domain_registry_cache() -> None:
+    """Drop the cached Domain registry (call after creating/renaming/deleting domains)."""
+    global _domain_registry_version
+    _domain_registry_version += 1
+    invalidate_metadata_answer_cache()
+
+
+def _load_domain_registry(db: Session):
+    """Return the cached registry tuple, rebuilding it from one projection query when stale."""
+    global _domain_registry_cache
+    cached = _domain_registry_cache
+    now = time.monotonic()
+    if (
+        cached is not None
+        and cached[1] == _domain_registry_version
+        and now - cached[0] < _DOMAIN_REGISTRY_TTL_S
+    ):
+        return cached
+
+    version = _domain_registry_version
+    rows = tuple(
+        (domain_id, name, description)
+        for domain_id, name, description in db.query(Domain.id, Domain.name, Domain.description)
+        .order_by(Domain.id)
+        .all()
+    )
+    norm_map: dict[str, int] = {
+        _normalize_registry_text(name): domain_id
+        for domain_id, name, _ in rows
+        if name
+    }
+    phrases = tuple((f" {dn_norm} ", domain_id) for dn_norm, domain_id in norm_map.items() if dn_norm)
+    _domain_registry_cache = (now, version, norm_map, phrases, rows)
+    return _domain_registry_cache
+
+
+def _domain_registry(db: Session) -> tuple[dict[str, int], tuple[tuple[str, int], ...]]:
+    """
+    Return the normalized domain-name -> id map plus the space-padded names
+    used for phrase matching.
+    """
+    cached = _load_domain_registry(db)
+    return cached[2], cached[3]
+
+
+def _domain_rows(db: Session) -> tuple[tuple[int, str, str | None], ...]:
+    """Return every domain as (id, name, description), in id order."""
+    return _load_domain_registry(db)[4]
 
 
 def _resolve_domain_from_registry(
@@ -57,20 +147,17 @@ def _resolve_domain_from_registry(
     candidate = h.get("domain") or h.get("target_domain") or h.get("domain_hint")
 
     q_norm = f" {_normalize_registry_text(question)} "
-    domains = db.query(Domain).all()
-    norm_map: dict[str, Domain] = {
-        _normalize_registry_text(d.name): d for d in domains if d.name
-    }
+    norm_map, phrases = _domain_registry(db)
 
     if candidate:
         cand_norm = _normalize_registry_text(candidate)
         if cand_norm in norm_map:
-            return norm_map[cand_norm]
+            return db.get(Domain, norm_map[cand_norm])
 
     # Phrase match: find a full normalized domain token inside the normalized question
-    for dn_norm, dom in norm_map.items():
-        if dn_norm and f" {dn_norm} " in q_norm:
-            return dom
+    for padded, domain_id in phrases:
+        if padded in q_norm:
+            return db.get(Domain, domain_id)
 
     return None
 
@@ -110,6 +197,130 @@ class QuestionAttribute(str, Enum):
 # =====================================================================
 # INTENT CLASSIFIER (rule-based, zero cost, instant)
 # =====================================================================
+# Sales intents in priority order (first stage with a keyword hit wins)
+_SALES_BUYING_STAGE = {
+    "Discovery": "Top",
+    "Solutioning": "Middle",
+    "Objection": "Middle",
+    "Proof": "Middle",
+    "Decision": "Bottom",
+}
+
+# Every keyword group classify_intent consults, indexed in one automaton so a
+# single pass over the question yields all of them; the function then applies
+# its rules in priority order. Triggers stay plain substrings ("count" also
+# fires on "counts"), so they are not reduced to whole-token set lookups.
+_CLASSIFY_KEYWORDS = KeywordClassifier((
+    ("domain_list", ("show all domains", "what domains do we have", "what domains", "list domains")),
+    ("domain_count", ("how many domains", "number of domains", "count domains")),
+    ("structured_count", ("how many", "count", "number of", "total count", "total number")),
+    ("factual", (
+        "percentage", "modules", "roi", "cost", "revenue", "profit",
+        "efficiency", "metrics", "analysis", "performance",
+    )),
+    ("count", (
+        "how many", "count of", "number of",
+        "total number", "total count", "how much",
+        "total", "altogether",
+    )),
+    ("classification", (
+        "which category", "under what category", "under which category",
+        "what category", "which domain", "under what domain",
+        "under which domain", "what domain", "which collection",
+        "what collection", "belongs to which", "belong to which",
+        "categorized under", "classified under", "fall under",
+        "comes under", "come under", "grouped under",
+        "associated with which", "assigned to which",
+    )),
+    # Sales stages (labels are the _SALES_BUYING_STAGE keys)
+    ("Discovery", ("problem", "issue", "pain", "we have bugs", "seeing bugs", "struggling", "where to start", "diagnose", "assess")),
+    ("Solutioning", ("how to", "how do i", "implement", "automate", "set up", "integrate", "fix", "deploy", "automation", "ci/cd", "test", "stabilize", "improve", "optimize")),
+    ("Objection", ("too expensive", "cost", "pricey", "budget", "afford", "not worth", "concern", "hesitant", "risk")),
+    ("Proof", ("case study", "have you worked", "who have you", "references", "clients", "proof", "evidence", "experience")),
+    ("Decision", ("buy", "purchase", "pricing", "proposal", "contract", "partner", "ready to buy", "sign", "engage", "trial")),
+))
+
+# Conversational openers: exact match, or plain prefix (str.startswith on the tuple)
+_GREETINGS = frozenset({
+    "hi", "hello", "hey", "good morning", "good afternoon",
+    "good evening", "good night", "thanks", "thank you",
+    "bye", "goodbye", "see you", "ok", "okay", "sure", "great",
+})
+_GREETING_PREFIXES = tuple(sorted(_GREETINGS))
+# handle_conversational replies, keyed by the exact (lowered, stripped) message
+_THANKS_MESSAGES = frozenset({"thanks", "thank you"})
+_GOODBYE_MESSAGES = frozenset({"bye", "goodbye", "see you"})
+_ACK_MESSAGES = frozenset({"ok", "okay", "sure", "great"})
+
+# Patterns compiled once at import (classify_intent, hint extractors, handlers).
+# Gaps and captures are bounded to 100 characters instead of .+ / .* so long
+# or adversarial questions cannot trigger super-linear backtracking.
+_RE_DOCUMENTS = re.compile(r"\bdocuments?\b")
+_RE_SHOW_LIST_DOMAINS = re.compile(r"\b(show|list)\b.{1,100}\b(domains?|domins?)\b")
+# Domain existence phrasings fused into one alternation (a single scan per question)
+_RE_DOMAIN_EXISTS = re.compile("|".join((
+    # explicit 'domain' keyword present
+    r"\bdo\s+we\s+have\b.{0,100}\bdomain\b",
+    r"\bdo\s+you\s+have\b.{0,100}\bdomain\b",
+    r"\bis\s+there\b.{0,100}\bdomain\b",
+    # canonical phrasing
+    r"\bdoes\b.{1,100}\bexist\s+as\s+(?:a\s+)?domain\b",
+    r"\b(?:is|does)\b.{1,100}\bdomain\b.{1,100}\b(?:available|exist|exists|listed|registered)\b",
+    r"\bis\b.{1,100}\b(?:a|an)\s+domain\b",
+    r"\bdo\s+we\s+have\s+any\s+domain\s+(?:called|named)\b",
+)))
+_RE_DOMAIN_CALLED = re.compile(r"\bdomain\s+(?:called|named)\s+(.{1,100}?)\s*(?:\?|$)")
+_RE_DO_WE_HAVE_DOMAIN = re.compile(r"\bdo\s+we\s+have\b\s+(?:a|an|any)?\s*(.{1,100}?)\s+domain\b")
+_RE_EXIST_AS_DOMAIN = re.compile(r"\bdoes\s+(.{1,100}?)\s+exist\s+as\s+(?:a\s+)?domain\b")
+_RE_IS_A_DOMAIN = re.compile(r"\bis\s+(.{1,100}?)\s+(?:a|an)\s+domain\b")
+_RE_LIST_SHOW = re.compile(r"\b(list|show)\b")
+_RE_WHICH_WHAT_DOCS = re.compile(r"\b(which|what)\s+documents?\b")
+_RE_DOC_UNDER_DOMAIN = re.compile(r"^(?!is\s+there\b)\s*(?:is|are)\s+(.{1,100}?)\s+under\s+(.{1,100}?)\s*(?:\?|$)")
+_RE_WHICH_DOCS = re.compile(r"which\s+documents?\b")
+_RE_DOMAIN_TOPIC = re.compile(
+    r"related to\s+|\bin\s+the\s+.{1,100}\s+domain\b|\bwhat\s+domai?n\b|\bwhich\s+domai?n\b"
+)
+_RE_HYBRID = re.compile(
+    r"(?:which|what)\s+(?:category|domain|collection).{1,100}and.{1,100}(?:about|what|why|tell)"
+)
+# Existence triggers fused into one alternation (a single scan per question).
+# Key fixes:
+# - Changed "is there any" to "is there" (catches "is there a", "is there the")
+# - Added "do we have", "do you have" without "any"
+# - Added "are there", "have we", "got"
+_RE_EXISTENCE = re.compile(
+    "|".join(
+        f"(?:{p})"
+        for p in (
+            r"is there",              # FIXED: "is there a" now matches
+            r"do we have",            # FIXED: more inclusive
+            r"do you have",           # FIXED: more inclusive
+            r"are there",             # More variants
+            r"have we",               # More variants
+            r"have you",              # More variants
+            r"do you exist",
+            r"does .{1,100} exist",
+            r"have any",
+            r"got any",
+            r"any.{0,100}document",   # "any X document"
+            r"any.{0,100}pdf",        # "any X PDF"
+            r"available",             # "are X available?"
+        )
+    )
+)
+_RE_HINT_DOMAIN = re.compile(r"(?:under|in|from|of)\s+(?:the\s+)?(.{1,100}?)\s+domain")
+_RE_HINT_CATEGORY = re.compile(r"(?:under|in|from|of)\s+(?:the\s+)?(.{1,100}?)\s+(?:category|collection)")
+_RE_TARGET_CATEGORY = re.compile(r"(?:category|collection)\s+(?:is|of)?\s+(.{1,100}?)(?:\?|$)")
+_RE_TARGET_DOMAIN = re.compile(r"domain\s+(?:is|of)?\s+(.{1,100}?)(?:\?|$)")
+_RE_WITH_DOMAINS = re.compile(r"\bwith\b.{1,100}\b(domains?|domins?)\b")
+_RE_WHITESPACE = re.compile(r"\s+")
+_RE_NON_WORD = re.compile(r"\W+")
+_RE_LEADING_IS_ARE = re.compile(r"^\s*(?:is|are)\s+", re.IGNORECASE)
+_RE_DOMAINS_RELATED_TO = re.compile(
+    r"\b(?:domains?|domins?)\b\s+(?:(?:are|is)\s+)?(?:related to|about|for|relevant to)\s+(.{1,100}?)\s*$"
+)
+
+
 def classify_intent(question: str) -> tuple[QuestionIntent, dict[str, Any]]:
     """
     Rule-based intent classification.  No API call, < 1 ms.
@@ -120,32 +331,36 @@ def classify_intent(question: str) -> tuple[QuestionIntent, dict[str, Any]]:
     - "is there any" → "is there" (catch "is there a", "is there the", etc.)
     - Better keyword coverage
     """
-    q = (question or "").lower().strip()
-    words = q.split()
+    intent, hints = _classify_normalized_question((question or "").lower().strip())
+    # Fresh dict per call: callers add to / mutate the hints
+    return intent, dict(hints)
+
+
+@functools.lru_cache(maxsize=4096)
+def _classify_normalized_question(q: str) -> tuple[QuestionIntent, tuple[tuple[str, Any], ...]]:
+    """Cached classify_intent on the lowercased/stripped question (retries, pings, repeats)."""
+    intent, hints = _classify_question(q)
+    return intent, tuple(hints.items())
+
+
+def _classify_question(q: str) -> tuple[QuestionIntent, dict[str, Any]]:
+    """classify_intent rules for an already lowercased/stripped question."""
+    # Empty input and bare greetings/acks (the bulk of short Slack messages)
+    # cannot match any rule below, so skip the regex and keyword passes.
+    if not q or q in _GREETINGS:
+        return QuestionIntent.CONVERSATIONAL, {}
 
-    is_doc_query = re.search(r"\bdocuments?\b", q) is not None
+    is_doc_query = _RE_DOCUMENTS.search(q) is not None
+    # Every keyword group present in the question, found in one pass
+    hits = _CLASSIFY_KEYWORDS.matching_labels(q)
 
     # ---- DOMAIN REGISTRY QUERIES (structured detection, DB resolution later) ----
     # These MUST be answered from the database (registry) and never from RAG.
-    if (
-        not is_doc_query
-        and (
-            re.search(r"\b(show|list)\b.+\b(domains?|domins?)\b", q)
-            or any(
-                kw in q
-                for kw in [
-                    "show all domains",
-                    "what domains do we have",
-                    "what domains",
-                    "list domains",
-                ]
-            )
-        )
-    ):
-        return QuestionIntent.DOMAIN_QUERY, {"domain_action": "list"}
-
-    if not is_doc_query and any(kw in q for kw in ["how many domains", "number of domains", "count domains"]):
-        return QuestionIntent.DOMAIN_QUERY, {"domain_action": "count"}
+    if not is_doc_query:
+        if "domain_list" in hits or _RE_SHOW_LIST_DOMAINS.search(q):
+            return QuestionIntent.DOMAIN_QUERY, {"domain_action": "list"}
+        if "domain_count" in hits:
+            return QuestionIntent.DOMAIN_QUERY, {"domain_action": "count"}
 
     # Domain existence checks
     # Examples:
@@ -153,36 +368,25 @@ def classify_intent(question: str) -> tuple[QuestionIntent, dict[str, Any]]:
     # - "Does AI Governance exist as a domain?"
     # - "Is SaaS a domain?" / "Is SaaS registered as a domain?"
     # Domain name resolution happens inside the handler from the registry.
-    domain_exist_patterns: list[tuple[str, str | None]] = [
-        # explicit 'domain' keyword present
-        (r"\bdo\s+we\s+have\b.*\bdomain\b", None),
-        (r"\bdo\s+you\s+have\b.*\bdomain\b", None),
-        (r"\bis\s+there\b.*\bdomain\b", None),
-        # canonical phrasing
-        (r"\bdoes\b.+\bexist\s+as\s+(?:a\s+)?domain\b", None),
-        (r"\b(is|does)\b.+\bdomain\b.+\b(available|exist|exists|listed|registered)\b", None),
-        (r"\bis\b.+\b(?:a|an)\s+domain\b", None),
-        (r"\bdo\s+we\s+have\s+any\s+domain\s+(?:called|named)\b", None),
-    ]
-    if any(re.search(p, q) for p, _ in domain_exist_patterns):
+    if _RE_DOMAIN_EXISTS.search(q):
         # Best-effort extraction of the requested domain phrase (exact resolution occurs in handler)
         hints: dict[str, Any] = {"domain_action": "exists"}
-        m = re.search(r"\bdomain\s+(?:called|named)\s+(.+?)\s*(?:\?|$)", q)
+        m = _RE_DOMAIN_CALLED.search(q)
         if m:
             hints["domain_hint"] = m.group(1).strip()
             return QuestionIntent.DOMAIN_QUERY, hints
 
-        m = re.search(r"\bdo\s+we\s+have\b\s+(?:a|an|any)?\s*(.+?)\s+domain\b", q)
+        m = _RE_DO_WE_HAVE_DOMAIN.search(q)
         if m:
             hints["domain_hint"] = m.group(1).strip()
             return QuestionIntent.DOMAIN_QUERY, hints
 
-        m = re.search(r"\bdoes\s+(.+?)\s+exist\s+as\s+(?:a\s+)?domain\b", q)
+        m = _RE_EXIST_AS_DOMAIN.search(q)
         if m:
             hints["domain_hint"] = m.group(1).strip()
             return QuestionIntent.DOMAIN_QUERY, hints
 
-        m = re.search(r"\bis\s+(.+?)\s+(?:a|an)\s+domain\b", q)
+        m = _RE_IS_A_DOMAIN.search(q)
         if m:
             hints["domain_hint"] = m.group(1).strip()
             return QuestionIntent.DOMAIN_QUERY, hints
@@ -191,24 +395,22 @@ def classify_intent(question: str) -> tuple[QuestionIntent, dict[str, Any]]:
 
     # ---- STRUCTURED COUNT/LISTING ----
     # These are still routed as metadata-only, with domain/category/doc-type extracted via regex.
-    if any(t in q for t in ["how many", "count", "number of", "total count", "total number"]):
+    if "structured_count" in hits:
         hints = _extract_count_hints(q)
-        return QuestionIntent.COUNT, {**hints}
+        return QuestionIntent.COUNT, hints
 
-    if re.search(r"\b(list|show)\b", q) and "document" in q:
-        hints = {**_extract_count_hints(q), **_extract_classification_hints(q)}
-        return QuestionIntent.DOCUMENT_LISTING, {**hints}
+    if "document" in q and _RE_LIST_SHOW.search(q):
+        hints = _extract_count_hints(q) | _extract_classification_hints(q)
+        return QuestionIntent.DOCUMENT_LISTING, hints
 
-    if re.search(r"\b(which|what)\s+documents?\b", q):
-        hints = {**_extract_count_hints(q), **_extract_classification_hints(q)}
-        return QuestionIntent.DOCUMENT_LISTING, {**hints}
+    # "which/what documents" implies the \bdocuments?\b match already in is_doc_query
+    if is_doc_query and _RE_WHICH_WHAT_DOCS.search(q):
+        hints = _extract_count_hints(q) | _extract_classification_hints(q)
+        return QuestionIntent.DOCUMENT_LISTING, hints
 
     # Deterministic verification: "Is <document> under <domain>?"
     # Route to metadata classification (no RAG) and let handler verify via SQL.
-    m = re.search(
-        r"^(?!is\s+there\b)\s*(?:is|are)\s+(.+?)\s+under\s+(.+?)\s*(?:\?|$)",
-        q,
-    )
+    m = _RE_DOC_UNDER_DOMAIN.match(q)
     if m:
         doc_hint = (m.group(1) or "").strip()
         dom_hint = (m.group(2) or "").strip()
@@ -221,118 +423,54 @@ def classify_intent(question: str) -> tuple[QuestionIntent, dict[str, Any]]:
 
     # --- Sales intent detection (adds hints: sales_intent, buying_stage) ---
     sales_hints: dict[str, Any] = {}
-    sales_patterns = {
-        "Discovery": ["problem", "issue", "pain", "we have bugs", "seeing bugs", "struggling", "where to start", "diagnose", "assess"],
-        "Solutioning": ["how to", "how do i", "implement", "automate", "set up", "integrate", "fix", "deploy", "automation", "ci/cd", "test", "stabilize", "improve", "optimize"],
-        "Objection": ["too expensive", "cost", "pricey", "budget", "afford", "not worth", "concern", "hesitant", "risk"],
-        "Proof": ["case study", "have you worked", "who have you", "references", "clients", "proof", "evidence", "experience"],
-        "Decision": ["buy", "purchase", "pricing", "proposal", "contract", "partner", "ready to buy", "sign", "engage", "trial"]
-    }
-
-    for intent_name, kws in sales_patterns.items():
-        for kw in kws:
-            if kw in q:
-                stage = "Top"
-                if intent_name in ("Solutioning", "Objection", "Proof"):
-                    stage = "Middle"
-                if intent_name == "Decision":
-                    stage = "Bottom"
-                sales_hints["sales_intent"] = intent_name
-                sales_hints["buying_stage"] = stage
-                # capture first matching sales intent only
-                break
-        if sales_hints:
-            break
+    # capture first matching sales intent only (stages checked in priority order)
+    sales_intent = next((stage for stage in _SALES_BUYING_STAGE if stage in hits), None)
+    if sales_intent is not None:
+        sales_hints["sales_intent"] = sales_intent
+        sales_hints["buying_stage"] = _SALES_BUYING_STAGE[sales_intent]
 
     # ---- CONVERSATIONAL ----
-    greetings = {
-        "hi", "hello", "hey", "good morning", "good afternoon",
-        "good evening", "good night", "thanks", "thank you",
-        "bye", "goodbye", "see you", "ok", "okay", "sure", "great",
-    }
     # Consider short greetings and sentences that start with a greeting
-    if q in greetings or len(words) <= 1 or any(q.startswith(g) for g in greetings):
-        return QuestionIntent.CONVERSATIONAL, {**{}, **sales_hints}
+    # (a stripped question without inner whitespace is a single word)
+    if q in _GREETINGS or _RE_WHITESPACE.search(q) is None or q.startswith(_GREETING_PREFIXES):
+        return QuestionIntent.CONVERSATIONAL, sales_hints
 
     # ---- FACTUAL CONTENT ----
-    factual_triggers = [
-        "percentage", "modules", "roi", "cost", "revenue", "profit",
-        "efficiency", "metrics", "analysis", "performance"
-    ]
-    if any(t in q for t in factual_triggers):
-        return QuestionIntent.FACTUAL_CONTENT, {**{}, **sales_hints}
+    if "factual" in hits:
+        return QuestionIntent.FACTUAL_CONTENT, sales_hints
 
     # ---- COUNT ----
-    count_triggers = [
-        "how many", "count of", "number of",
-        "total number", "total count", "how much",
-        "total", "altogether",
-    ]
-    if any(t in q for t in count_triggers):
+    if "count" in hits:
         hints = _extract_count_hints(q)
-        return QuestionIntent.COUNT, {**hints, **sales_hints}
-
-    # ---- EXISTENCE ---- (ENHANCED: More inclusive patterns)
-    # Key fixes:
-    # - Changed "is there any" to "is there" (catches "is there a", "is there the")
-    # - Added "do we have", "do you have" without "any"
-    # - Added "are there", "have we", "got"
-    existence_triggers = [
-        r"is there",              # FIXED: "is there a" now matches
-        r"do we have",            # FIXED: more inclusive
-        r"do you have",           # FIXED: more inclusive
-        r"are there",             # More variants
-        r"have we",               # More variants
-        r"have you",              # More variants
-        r"do you exist",
-        r"does .+ exist",
-        r"have any",
-        r"got any",
-        r"any.*document",         # "any X document"
-        r"any.*pdf",              # "any X PDF"
-        r"available",             # "are X available?"
-    ]
-    if any(re.search(t, q) for t in existence_triggers):
+        return QuestionIntent.COUNT, hints | sales_hints
+
+    # ---- EXISTENCE ---- (ENHANCED: More inclusive patterns, see _RE_EXISTENCE)
+    if _RE_EXISTENCE.search(q):
         hints = _extract_existence_hints(q)
-        return QuestionIntent.EXISTENCE, {**hints, **sales_hints}
+        return QuestionIntent.EXISTENCE, hints | sales_hints
 
     # ---- CLASSIFICATION ---- (ENHANCED: Document category/domain lookup)
-    classification_triggers = [
-        "which category", "under what category", "under which category",
-        "what category", "which domain", "under what domain",
-        "under which domain", "what domain", "which collection",
-        "what collection", "belongs to which", "belong to which",
-        "categorized under", "classified under", "fall under",
-        "comes under", "come under", "grouped under",
-        "associated with which", "assigned to which",
-    ]
-    if any(t in q for t in classification_triggers):
+    if "classification" in hits:
         hints = _extract_classification_hints(q)
-        return QuestionIntent.CLASSIFICATION, {**hints, **sales_hints}
+        return QuestionIntent.CLASSIFICATION, hints | sales_hints
 
     # "Which documents belong to X" / "Which documents are in X" pattern
     # Check this before other classification patterns to prioritize listing queries
-    if re.search(r"which\s+documents?\b", q):
+    if is_doc_query and _RE_WHICH_DOCS.search(q):
         hints = _extract_classification_hints(q)
-        return QuestionIntent.DOCUMENT_LISTING, {**hints, **sales_hints}
+        return QuestionIntent.DOCUMENT_LISTING, hints | sales_hints
 
     # Domain-specific queries (e.g., "related to cybersecurity", "in the X domain")
-    if re.search(
-        r"related to\s+|\bin\s+the\s+.+\s+domain\b|\bwhat\s+domai?n\b|\bwhich\s+domai?n\b",
-        q,
-    ):
+    if _RE_DOMAIN_TOPIC.search(q):
         hints = _extract_classification_hints(q)
-        return QuestionIntent.DOMAIN_QUERY, {**hints, **sales_hints}
+        return QuestionIntent.DOMAIN_QUERY, hints | sales_hints
 
     # ---- HYBRID ----
-    if re.search(
-        r"(?:which|what)\s+(?:category|domain|collection).+and.+(?:about|what|why|tell)",
-        q,
-    ):
-        return QuestionIntent.HYBRID, {**{}, **sales_hints}
+    if _RE_HYBRID.search(q):
+        return QuestionIntent.HYBRID, sales_hints
 
     # ---- DEFAULT ----
-    return QuestionIntent.FACTUAL_CONTENT, {**{}, **sales_hints}
+    return QuestionIntent.FACTUAL_CONTENT, sales_hints
 
 
 # =====================================================================
@@ -357,6 +495,8 @@ SOLUTION_KEYWORDS: dict[str, list[str]] = {
         "what should we do", "consulting", "process chaos", "modernize", "strategy advice",
     ],
 }
+# Solutions in SOLUTION_KEYWORDS order, matched in a single pass over the question
+_SOLUTION_CLASSIFIER = KeywordClassifier(SOLUTION_KEYWORDS.items())
 
 
 def recommend_solution(question: str) -> str | None:
@@ -364,12 +504,45 @@ def recommend_solution(question: str) -> str | None:
 
     Returns one of the keys in `SOLUTION_KEYWORDS` or None if no match.
     """
-    q = (question or "").lower()
-    for solution, keywords in SOLUTION_KEYWORDS.items():
-        for kw in keywords:
-            if kw in q:
-                return solution
-    return None
+    return _recommend_solution_lc((question or "").lower())
+
+
+@functools.lru_cache(maxsize=4096)
+def _recommend_solution_lc(q: str) -> str | None:
+    return _SOLUTION_CLASSIFIER.classify(q)
+
+
+# Objection types in priority order: price, competition, DIY / build vs buy
+_OBJECTION_CLASSIFIER = KeywordClassifier((
+    ("price", ("too expensive", "expensive", "cost", "pricey", "budget", "afford")),
+    ("comp", ("competitor", "vs ", "instead of", "better than", "compare", "comparative")),
+    ("diy", ("do it ourselves", "in-house", "build ourselves", "diy", "internal team")),
+))
+
+# Canned Sales Mode replies (Recommendation → Why → How → Proof)
+_PRICE_OBJECTION_RESPONSE = (
+    "Recommendation: We can discuss flexible pricing or a pilot to reduce upfront cost.\n"
+    "Why: A short pilot reduces your risk and demonstrates value before larger spend.\n"
+    "How: Start with a 2-4 week stabilization pilot (scope: critical flows), deliver quick wins, then expand.\n"
+    "Proof: I can pull case studies showing reduced time-to-stability and cost benefits — would you like me to fetch them?"
+)
+_COMP_OBJECTION_RESPONSE = (
+    "Recommendation: Let's evaluate the key decision criteria (TCO, time-to-value, support).\n"
+    "Why: Feature parity is just one axis — deployment speed and support often determine success.\n"
+    "How: I can produce a short comparison matrix vs typical competitors and highlight differentiators.\n"
+    "Proof: I can fetch examples and outcomes from our prior engagements — shall I pull those now?"
+)
+_DIY_OBJECTION_RESPONSE = (
+    "Recommendation: Consider a phased approach — pilot with our team, then transition knowledge to your team.\n"
+    "Why: Building in-house often delays time-to-value and increases hidden costs.\n"
+    "How: Start with our rapid-assist engagement (knowledge transfer included) to accelerate delivery and lower risk.\n"
+    "Proof: I can pull examples where clients adopted this model to scale efficiently — would you like those?"
+)
+_OBJECTION_RESPONSES = {
+    "price": _PRICE_OBJECTION_RESPONSE,
+    "comp": _COMP_OBJECTION_RESPONSE,
+    "diy": _DIY_OBJECTION_RESPONSE,
+}
 
 
 def handle_objection(question: str) -> str | None:
@@ -379,45 +552,29 @@ def handle_objection(question: str) -> str | None:
     a concise Sales Mode response following Recommendation → Why → How → Proof.
     Returns None if it cannot confidently handle the objection.
     """
-    q = (question or "").lower()
-
-    price_kw = ["too expensive", "expensive", "cost", "pricey", "budget", "afford"]
-    comp_kw = ["competitor", "vs ", "instead of", "better than", "compare", "comparative"]
-    diy_kw = ["do it ourselves", "in-house", "build ourselves", "diy", "internal team"]
-
-    # Price objection
-    if any(kw in q for kw in price_kw):
-        return (
-            "Recommendation: We can discuss flexible pricing or a pilot to reduce upfront cost.\n"
-            "Why: A short pilot reduces your risk and demonstrates value before larger spend.\n"
-            "How: Start with a 2-4 week stabilization pilot (scope: critical flows), deliver quick wins, then expand.\n"
-            "Proof: I can pull case studies showing reduced time-to-stability and cost benefits — would you like me to fetch them?"
-        )
+    return _handle_objection_lc((question or "").lower())
 
-    # Competition comparison
-    if any(kw in q for kw in comp_kw):
-        return (
-            "Recommendation: Let's evaluate the key decision criteria (TCO, time-to-value, support).\n"
-            "Why: Feature parity is just one axis — deployment speed and support often determine success.\n"
-            "How: I can produce a short comparison matrix vs typical competitors and highlight differentiators.\n"
-            "Proof: I can fetch examples and outcomes from our prior engagements — shall I pull those now?"
-        )
-
-    # DIY / build vs buy
-    if any(kw in q for kw in diy_kw):
-        return (
-            "Recommendation: Consider a phased approach — pilot with our team, then transition knowledge to your team.\n"
-            "Why: Building in-house often delays time-to-value and increases hidden costs.\n"
-            "How: Start with our rapid-assist engagement (knowledge transfer included) to accelerate delivery and lower risk.\n"
-            "Proof: I can pull examples where clients adopted this model to scale efficiently — would you like those?"
-        )
 
-    return None
+@functools.lru_cache(maxsize=4096)
+def _handle_objection_lc(q: str) -> str | None:
+    return _OBJECTION_RESPONSES.get(_OBJECTION_CLASSIFIER.classify(q))
 
 
 # =====================================================================
 # ATTRIBUTE MAPPER (Maps Intent → Attribute for hard routing)
 # =====================================================================
+_INTENT_TO_ATTR: dict[QuestionIntent, QuestionAttribute] = {
+    QuestionIntent.CONVERSATIONAL: QuestionAttribute.METADATA_ONLY,
+    QuestionIntent.COUNT: QuestionAttribute.DOCUMENT_COUNT,
+    QuestionIntent.EXISTENCE: QuestionAttribute.DOCUMENT_EXIST,
+    QuestionIntent.CLASSIFICATION: QuestionAttribute.DOCUMENT_CATEGORY,
+    QuestionIntent.DOCUMENT_LISTING: QuestionAttribute.DOCUMENT_LISTING,
+    QuestionIntent.DOMAIN_QUERY: QuestionAttribute.DOMAIN_QUERY,
+    QuestionIntent.HYBRID: QuestionAttribute.DOCUMENT_REFERENCE,
+    QuestionIntent.FACTUAL_CONTENT: QuestionAttribute.FACTUAL,
+}
+
+
 def map_intent_to_attribute(intent: QuestionIntent) -> QuestionAttribute:
     """
     Map Intent to Attribute for HARD ROUTING CONSTRAINTS.
@@ -425,46 +582,49 @@ def map_intent_to_attribute(intent: QuestionIntent) -> QuestionAttribute:
     This ensures metadata-only questions NEVER reach RAG,
     and RAG questions NEVER try to answer metadata queries.
     """
-    mapping = {
-        QuestionIntent.CONVERSATIONAL: QuestionAttribute.METADATA_ONLY,
-        QuestionIntent.COUNT: QuestionAttribute.DOCUMENT_COUNT,
-        QuestionIntent.EXISTENCE: QuestionAttribute.DOCUMENT_EXIST,
-        QuestionIntent.CLASSIFICATION: QuestionAttribute.DOCUMENT_CATEGORY,
-        QuestionIntent.DOCUMENT_LISTING: QuestionAttribute.DOCUMENT_LISTING,
-        QuestionIntent.DOMAIN_QUERY: QuestionAttribute.DOMAIN_QUERY,
-        QuestionIntent.HYBRID: QuestionAttribute.DOCUMENT_REFERENCE,
-        QuestionIntent.FACTUAL_CONTENT: QuestionAttribute.FACTUAL,
-    }
-    return mapping.get(intent, QuestionAttribute.FACTUAL)
+    return _INTENT_TO_ATTR.get(intent, QuestionAttribute.FACTUAL)
 
 
 # =====================================================================
 # HINT EXTRACTION HELPERS
 # =====================================================================
+# Doc types in priority order (first type with a keyword hit wins). The
+# generic "pdf"/"document" types come last and only count for existence checks.
+_DOC_TYPE_KEYWORDS = KeywordClassifier((
+    ("proposal", ("proposal", "proposals")),
+    ("case_study", ("case study", "case studies")),
+    ("solution", ("solution", "solutions", "service", "services")),
+    ("policy", ("policy", "policies")),
+    ("pdf", ("pdf",)),
+    ("document", ("document",)),
+))
+_GENERIC_DOC_TYPES = frozenset({"pdf", "document"})
+
+
+def _scan_doc_type(q: str, *, include_generic: bool = False) -> str | None:
+    """Return the first doc type named in the question (one keyword pass)."""
+    doc_type = _DOC_TYPE_KEYWORDS.classify(q)
+    if doc_type in _GENERIC_DOC_TYPES and not include_generic:
+        return None
+    return doc_type
+
+
 def _extract_count_hints(q: str) -> dict[str, Any]:
     """Pull filtering clues from count questions."""
     hints: dict[str, Any] = {}
 
     # Type hints
-    type_map = {
-        "proposal": "proposal", "proposals": "proposal",
-        "case study": "case_study", "case studies": "case_study",
-        "solution": "solution", "solutions": "solution",
-        "service": "solution", "services": "solution",
-        "policy": "policy", "policies": "policy",
-    }
-    for kw, doc_type in type_map.items():
-        if kw in q:
-            hints["doc_type"] = doc_type
-            break
+    doc_type = _scan_doc_type(q)
+    if doc_type:
+        hints["doc_type"] = doc_type
 
     # Domain hint  ("under AI engineering domain")
-    m = re.search(r"(?:under|in|from|of)\s+(?:the\s+)?(.+?)\s+domain", q)
+    m = _RE_HINT_DOMAIN.search(q)
     if m:
         hints["domain_hint"] = m.group(1).strip()
 
     # Category hint  ("in proposals category")
-    m = re.search(r"(?:under|in|from|of)\s+(?:the\s+)?(.+?)\s+(?:category|collection)", q)
+    m = _RE_HINT_CATEGORY.search(q)
     if m:
         hints["category_hint"] = m.group(1).strip()
 
@@ -480,19 +640,9 @@ def _extract_existence_hints(q: str) -> dict[str, Any]:
     hints: dict[str, Any] = {}
     
     # Extract document type/keyword they're looking for
-    type_map = {
-        "proposal": "proposal", "proposals": "proposal",
-        "case study": "case_study", "case studies": "case_study",
-        "solution": "solution", "solutions": "solution",
-        "service": "solution", "services": "solution",
-        "policy": "policy", "policies": "policy",
-        "pdf": "pdf",
-        "document": "document",
-    }
-    for kw, doc_type in type_map.items():
-        if kw in q:
-            hints["search_type"] = doc_type
-            break
+    doc_type = _scan_doc_type(q, include_generic=True)
+    if doc_type:
+        hints["search_type"] = doc_type
     
     return hints
 
@@ -502,21 +652,146 @@ def _extract_classification_hints(q: str) -> dict[str, Any]:
     hints: dict[str, Any] = {}
     
     # Look for category/domain being asked about
-    m = re.search(r"(?:category|collection)\s+(?:is|of)?\s+(.+?)(?:\?|$)", q)
+    m = _RE_TARGET_CATEGORY.search(q)
     if m:
         hints["target_category"] = m.group(1).strip()
     
-    m = re.search(r"domain\s+(?:is|of)?\s+(.+?)(?:\?|$)", q)
+    m = _RE_TARGET_DOMAIN.search(q)
     if m:
         hints["target_domain"] = m.group(1).strip()
     
     return hints
 
 
+# =====================================================================
+# METADATA ANSWER CACHE (repeated "how many / list" questions)
+# =====================================================================
+# Answers are keyed on (handler, normalized question, hints, categories,
+# version) and expire after a short TTL. The version is bumped in-process
+# when documents/categories/domains change; the TTL bounds staleness for
+# changes made elsewhere (e.g. another worker finishing document processing).
+_METADATA_ANSWER_TTL_S = 60.0
+_METADATA_ANSWER_MAX = 512
+_metadata_answer_version = 0
+_metadata_answer_cache: OrderedDict[tuple, tuple[float, str | None]] = OrderedDict()
+_metadata_answer_lock = threading.Lock()
+
+
+# Processed-document counts recorded by the listing handlers, so a follow-up
+# "how many" for the same scope is answered without a COUNT query. Keyed on
+# ("domain", domain_id, doc_type) or ("category", category_id); shares the
+# answer cache's lock, TTL and version.
+_doc_count_cache: dict[tuple, tuple[float, int, int]] = {}
+
+
+def invalidate_metadata_answer_cache() -> None:
+    """Drop cached metadata answers (call after documents/categories change)."""
+    global _metadata_answer_version
+    with _metadata_answer_lock:
+        _metadata_answer_version += 1
+        _metadata_answer_cache.clear()
+        _doc_count_cache.clear()
+
+
+def _remember_doc_count(scope: tuple, count: int, version: int) -> None:
+    """Record a count read under ``version`` (ignored if the data changed since)."""
+    with _metadata_answer_lock:
+        if version != _metadata_answer_version:
+            return
+        if len(_doc_count_cache) >= _METADATA_ANSWER_MAX:
+            _doc_count_cache.clear()
+        _doc_count_cache[scope] = (time.monotonic(), version, count)
+
+
+def _recall_doc_count(scope: tuple) -> int | None:
+    """Return a count recorded for ``scope`` within the TTL, or None."""
+    with _metadata_answer_lock:
+        hit = _doc_count_cache.get(scope)
+        if (
+            hit is not None
+            and hit[1] == _metadata_answer_version
+            and time.monotonic() - hit[0] < _METADATA_ANSWER_TTL_S
+        ):
+            return hit[2]
+    return None
+
+
+def _cached_metadata_answer(handler: Callable[..., str | None]) -> Callable[..., str | None]:
+    """Memoize a ``handler(question, db, categories, hints)`` answer for a short TTL."""
+
+    @functools.wraps(handler)
+    def wrapper(
+        question: str,
+        db: Session,
+        categories: list[Category],
+        hints: dict[str, Any] | None = None,
+    ) -> str | None:
+        try:
+            key = (
+                handler.__name__,
+                (question or "").lower().strip(),
+                frozenset((hints or {}).items()),
+                tuple((c.id, c.name, c.collection_name) for c in categories),
+                _metadata_answer_version,
+            )
+            hash(key)
+        except TypeError:  # unhashable hint value: answer uncached
+            return handler(question, db, categories, hints)
+
+        now = time.monotonic()
+        with _metadata_answer_lock:
+            hit = _metadata_answer_cache.get(key)
+            if hit is not None and now - hit[0] < _METADATA_ANSWER_TTL_S:
+                _metadata_answer_cache.move_to_end(key)
+                return hit[1]
+
+        answer = handler(question, db, categories, hints)
+        with _metadata_answer_lock:
+            # Skip storing if the data changed while the handler was running
+            if key[-1] == _metadata_answer_version:
+                _metadata_answer_cache[key] = (now, answer)
+                _metadata_answer_cache.move_to_end(key)
+                while len(_metadata_answer_cache) > _METADATA_ANSWER_MAX:
+                    _metadata_answer_cache.popitem(last=False)
+        return answer
+
+    return wrapper
+
+
 # =====================================================================
 # METADATA HANDLERS  (no RAG, direct DB queries)
 # =====================================================================
+# Category/collection name fragments per doc type (handle_count doc_type hint)
+_COUNT_CATEGORY_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "proposal": ("proposal",),
+    "case_study": ("case stud", "case_stud"),
+    "solution": ("solution", "service"),
+    "policy": ("policy", "policies"),
+}
+# Title/description fragments per search_type hint (handle_existence)
+_EXISTENCE_SEARCH_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "proposal": ("proposal",),
+    "case_study": ("case stud", "case_stud"),
+    "case studies": ("case stud", "case_stud"),
+    "solution": ("solution",),
+    "service": ("service",),
+    "policy": ("policy", "policies"),
+    "pdf": ("pdf",),
+}
+# Type phrases in the question → category name fragments (handle_existence);
+# the first phrase in this order that the question contains wins
+_EXISTENCE_TYPE_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "proposal": ("proposal",),
+    "case study": ("case stud", "case_stud"),
+    "case studies": ("case stud", "case_stud"),
+    "solution": ("solution",),
+    "service": ("service",),
+    "policy": ("policy", "policies"),
+}
+_EXISTENCE_TYPE_CLASSIFIER = KeywordClassifier((name, (name,)) for name in _EXISTENCE_TYPE_KEYWORDS)
+
 
+@_cached_metadata_answer
 def handle_count(
     question: str,
     db: Session,
@@ -526,9 +801,6 @@ def handle_count(
     """Handle COUNT intent: answer with document counts from the database."""
     q = question.lower()
 
-    from app.utils.logging import get_logger
-    logger = get_logger("domain_query")
-
     # --- Filter by category ---
     category_hint = hints.get("category_hint")
     if category_hint:
@@ -537,10 +809,12 @@ def handle_count(
                 category_hint in cat.name.lower()
                 or category_hint in cat.collection_name.lower()
             ):
-                count = db.query(Document).filter(
-                    Document.category_id == cat.id,
-                    Document.processed == True,
-                ).count()
+                count = _recall_doc_count(("category", cat.id))
+                if count is None:
+                    count = db.query(Document).filter(
+                        Document.category_id == cat.id,
+                        Document.processed == True,
+                    ).count()
                 return (
                     f"There are **{count} document{'s' if count != 1 else ''}** "
                     f"in the **{cat.name}** collection."
@@ -557,7 +831,7 @@ def handle_count(
         or dom is not None
     )
     if domain_scoped:
-        logger.info(
+        _LOG_DOMAIN_QUERY.info(
             "handle_count: detected_domain=%s",
             dom.name if dom else None,
         )
@@ -570,34 +844,29 @@ def handle_count(
                 else "This domain is not listed in our registry."
             )
 
-        query = (
-            db.query(func.count(func.distinct(Document.id)))
-            .filter(Document.domain_id == dom.id, Document.processed == True)
-        )
-
         # Optional doc type narrowing (case study / proposal etc)
         doc_type = hints.get("doc_type")
-        if doc_type:
-            query = query.filter(Document.doc_type == doc_type)
+        count = _recall_doc_count(("domain", dom.id, doc_type or None))
+        if count is None:
+            query = (
+                db.query(func.count(Document.id))
+                .filter(Document.domain_id == dom.id, Document.processed == True)
+            )
+            if doc_type:
+                query = query.filter(Document.doc_type == doc_type)
 
-        count = query.scalar() or 0
-        logger.info(
-            "SQL: SELECT COUNT(DISTINCT documents.id) WHERE domain_id=%s",
-            dom.id,
-        )
-        logger.info("Row count returned: %s", count)
+            count = query.scalar() or 0
+            _LOG_DOMAIN_QUERY.info(
+                "SQL: SELECT COUNT(documents.id) WHERE domain_id=%s",
+                dom.id,
+            )
+        _LOG_DOMAIN_QUERY.info("Row count returned: %s", count)
         return f"There are **{count} document{'s' if count != 1 else ''}** under the **{dom.name}** domain."
 
     # --- Filter by doc type keyword ---
     doc_type = hints.get("doc_type")
     if doc_type:
-        kw_map = {
-            "proposal": ["proposal"],
-            "case_study": ["case stud", "case_stud"],
-            "solution": ["solution", "service"],
-            "policy": ["policy", "policies"],
-        }
-        keywords = kw_map.get(doc_type, [doc_type])
+        keywords = _COUNT_CATEGORY_KEYWORDS.get(doc_type, (doc_type,))
         matching = [
             cat for cat in categories
             if any(
@@ -606,12 +875,10 @@ def handle_count(
             )
         ]
         if matching:
-            total = 0
-            for cat in matching:
-                total += db.query(Document).filter(
-                    Document.category_id == cat.id,
-                    Document.processed == True,
-                ).count()
+            total = db.query(func.count(Document.id)).filter(
+                Document.category_id.in_([cat.id for cat in matching]),
+                Document.processed == True,
+            ).scalar() or 0
             label = doc_type.replace("_", " ")
             return (
                 f"There are **{total} {label} document{'s' if total != 1 else ''}** "
@@ -619,13 +886,18 @@ def handle_count(
             )
 
     # --- Generic count (all documents) ---
-    total = db.query(Document).filter(Document.processed == True).count()
+    # One grouped query gives both the total and the per-category breakdown
+    rows = (
+        db.query(Document.category_id, func.count(Document.id))
+        .filter(Document.processed == True)
+        .group_by(Document.category_id)
+        .all()
+    )
+    count_by_cat = {category_id: int(c or 0) for category_id, c in rows}
+    total = sum(count_by_cat.values())
     breakdown = []
     for cat in categories:
-        c = db.query(Document).filter(
-            Document.category_id == cat.id,
-            Document.processed == True,
-        ).count()
+        c = count_by_cat.get(cat.id, 0)
         if c > 0:
             breakdown.append(f"• **{cat.name}**: {c}")
 
@@ -652,7 +924,7 @@ def handle_classification(
 
     def _find_docs_by_title_guess(title_guess: str) -> list[Document]:
         guess = (title_guess or "").strip().strip("?.,!\"'()")
-        guess = re.sub(r"\s+", " ", guess)
+        guess = _RE_WHITESPACE.sub(" ", guess)
         if not guess:
             return []
 
@@ -669,7 +941,7 @@ def handle_classification(
 
         # Fallback: token AND match (still deterministic)
         stop = {"the", "a", "an", "is", "are", "was", "were", "does", "do", "under", "in", "of"}
-        tokens = [t for t in re.split(r"\W+", guess.lower()) if len(t) >= 3 and t not in stop]
+        tokens = [t for t in _RE_NON_WORD.split(guess.lower()) if len(t) >= 3 and t not in stop]
         if not tokens:
             return []
         conds = [Document.title.ilike(f"%{t}%") for t in tokens[:6]]
@@ -696,7 +968,7 @@ def handle_classification(
         doc_guess = h.get("doc_hint")
         if not doc_guess and " under " in q:
             left = question.split(" under ", 1)[0]
-            doc_guess = re.sub(r"^\s*(?:is|are)\s+", "", left, flags=re.IGNORECASE).strip()
+            doc_guess = _RE_LEADING_IS_ARE.sub("", left).strip()
 
         if doc_guess:
             docs = _find_docs_by_title_guess(doc_guess)
@@ -723,28 +995,41 @@ def handle_classification(
 
     # If we have an entity, look it up in documents
     if entity:
-        docs = db.query(Document).filter(
-            Document.title.ilike(f"%{entity}%"),
-            Document.processed == True,
-        ).all()
+        # Category and domain names come back in the same query (no per-document lookups)
+        docs = (
+            db.query(
+                Document.title,
+                Document.category_id,
+                Document.category,
+                Category.name,
+                Domain.name,
+            )
+            .outerjoin(Category, Document.category_id == Category.id)
+            .outerjoin(Domain, Document.domain_id == Domain.id)
+            .filter(
+                Document.title.ilike(f"%{entity}%"),
+                Document.processed == True,
+            )
+            .order_by(Document.id)
+            .all()
+        )
 
         if docs:
             results = []
-            for doc in docs:
+            for title, category_id, legacy_category, category_name, domain_name in docs:
                 cat_name = "Uncategorized"
                 domain_names: list[str] = []
 
-                if doc.category_id:
-                    cat = db.query(Category).filter(Category.id == doc.category_id).first()
-                    if cat:
-                        cat_name = cat.name
-                elif doc.category:
-                    cat_name = doc.category
+                if category_id:
+                    if category_name:
+                        cat_name = category_name
+                elif legacy_category:
+                    cat_name = legacy_category
 
-                if doc.domain_ref is not None and doc.domain_ref.name:
-                    domain_names = [doc.domain_ref.name]
+                if domain_name:
+                    domain_names = [domain_name]
 
-                line = f"**{doc.title}** → Category: **{cat_name}**"
+                line = f"**{title}** → Category: **{cat_name}**"
                 if domain_names:
                     line += f" | Domain: **{', '.join(domain_names)}**"
                 results.append(line)
@@ -760,13 +1045,13 @@ def handle_classification(
     for cat in categories:
         if cat.name.lower() in q or cat.collection_name.lower() in q:
             docs = (
-                db.query(Document)
+                db.query(Document.title)
                 .filter(Document.category_id == cat.id, Document.processed == True)
                 .order_by(Document.title)
                 .all()
             )
             if docs:
-                titles = [f"• {d.title}" for d in docs]
+                titles = [f"• {title}" for (title,) in docs]
                 return (
                     f"The **{cat.name}** collection has "
                     f"**{len(docs)} document{'s' if len(docs) != 1 else ''}**:\n\n"
@@ -777,6 +1062,7 @@ def handle_classification(
     return None  # Couldn't resolve from metadata → fall through to RAG
 
 
+@_cached_metadata_answer
 def handle_listing(
     question: str,
     db: Session,
@@ -792,34 +1078,36 @@ def handle_listing(
     q = question.lower()
 
     include_domain_names = bool(
-        re.search(r"\bdocuments?\b", q)
+        _RE_DOCUMENTS.search(q)
         and (
             "domain name" in q
             or "their domain" in q
-            or re.search(r"\bwith\b.+\b(domains?|domins?)\b", q)
+            or _RE_WITH_DOMAINS.search(q)
         )
     )
 
     if include_domain_names:
+        max_rows = 200
+        # Fetch one row past the page: the total is only counted when it overflows
         rows = (
             db.query(Document.title, Domain.name)
             .outerjoin(Domain, Document.domain_id == Domain.id)
             .filter(Document.processed == True)
             .order_by(Document.title)
+            .limit(max_rows + 1)
             .all()
         )
         if not rows:
             return "I don't have any documents in the registry yet."
 
-        max_rows = 200
-        shown = rows[:max_rows]
         lines = [
             f"• **{title}** → Domain: **{domain_name or 'Unassigned'}**"
-            for title, domain_name in shown
+            for title, domain_name in rows[:max_rows]
         ]
         suffix = ""
         if len(rows) > max_rows:
-            suffix = f"\n\n...and {len(rows) - max_rows} more."
+            total = db.query(func.count(Document.id)).filter(Document.processed == True).scalar() or 0
+            suffix = f"\n\n...and {total - max_rows} more."
         return "Here are the documents with their domain names:\n\n" + "\n".join(lines) + suffix
 
     # Filter by category hint (prefer explicit category/collection requests)
@@ -827,23 +1115,22 @@ def handle_listing(
     if category_hint:
         for cat in categories:
             if category_hint in cat.name.lower() or category_hint in cat.collection_name.lower():
+                version = _metadata_answer_version
                 docs = (
-                    db.query(Document)
+                    db.query(Document.title)
                     .filter(Document.category_id == cat.id, Document.processed == True)
                     .order_by(Document.title)
                     .all()
                 )
+                _remember_doc_count(("category", cat.id), len(docs), version)
                 if docs:
-                    titles = [f"• {d.title}" for d in docs]
+                    titles = [f"• {title}" for (title,) in docs]
                     return (
                         f"The **{cat.name}** collection has **{len(docs)} document{'s' if len(docs) != 1 else ''}**:\n\n"
                         + "\n".join(titles)
                     )
                 return f"The **{cat.name}** collection exists but has no documents yet."
 
-    from app.utils.logging import get_logger
-    logger = get_logger("domain_listing")
-
     # Filter by domain (registry exact match; implicit match allowed)
     dom = _resolve_domain_from_registry(db, question, hints)
     domain_scoped = bool(
@@ -854,7 +1141,7 @@ def handle_listing(
         or dom is not None
     )
     if domain_scoped:
-        logger.info(
+        _LOG_DOMAIN_LISTING.info(
             "handle_listing: detected_intent=DOCUMENT_LISTING, detected_domain=%s",
             dom.name if dom else None,
         )
@@ -866,7 +1153,7 @@ def handle_listing(
                 else "This domain is not listed in our registry."
             )
 
-        docs_query = db.query(Document).filter(
+        docs_query = db.query(Document.title).filter(
             Document.domain_id == dom.id,
             Document.processed == True,
         )
@@ -876,18 +1163,17 @@ def handle_listing(
         if doc_type:
             docs_query = docs_query.filter(Document.doc_type == doc_type)
 
-        docs = (
-            docs_query.distinct(Document.id)
-            .order_by(Document.title)
-            .all()
-        )
-        logger.info(
-            "SQL: SELECT DISTINCT documents.id, documents.title WHERE domain_id=%s",
+        # One row per document: the filter is on documents alone, so no DISTINCT needed
+        version = _metadata_answer_version
+        docs = docs_query.order_by(Document.title).all()
+        _remember_doc_count(("domain", dom.id, doc_type or None), len(docs), version)
+        _LOG_DOMAIN_LISTING.info(
+            "SQL: SELECT documents.id, documents.title WHERE domain_id=%s",
             dom.id,
         )
-        logger.info("Row count returned: %s", len(docs))
+        _LOG_DOMAIN_LISTING.info("Row count returned: %s", len(docs))
         if docs:
-            titles = [f"• {d.title}" for d in docs]
+            titles = [f"• {title}" for (title,) in docs]
             return (
                 f"Found **{len(docs)} documents** under the **{dom.name}** domain:\n\n"
                 + "\n".join(titles)
@@ -895,9 +1181,15 @@ def handle_listing(
         return f"The **{dom.name}** domain exists but has no documents yet."
 
     # Generic listing: return recent/top documents
-    docs = db.query(Document).filter(Document.processed == True).order_by(Document.created_at.desc()).limit(20).all()
+    docs = (
+        db.query(Document.title)
+        .filter(Document.processed == True)
+        .order_by(Document.created_at.desc())
+        .limit(20)
+        .all()
+    )
     if docs:
-        titles = [f"• {d.title}" for d in docs]
+        titles = [f"• {title}" for (title,) in docs]
         return "Here are some documents I have:\n\n" + "\n".join(titles)
     return "I don't have any documents in the registry yet."
 
@@ -914,14 +1206,16 @@ def handle_domain_existence(
         hints = {}
     domain_name = hints.get("domain") or hints.get("domain_hint")
     domain_name_norm = domain_name.lower().strip() if domain_name else None
-    from app.utils.logging import get_logger
-    logger = get_logger("domain_existence")
-    logger.info(f"handle_domain_existence: detected_intent=DOMAIN_EXISTENCE, detected_domain={domain_name_norm}")
+    _LOG_DOMAIN_EXISTENCE.info(f"handle_domain_existence: detected_intent=DOMAIN_EXISTENCE, detected_domain={domain_name_norm}")
     if not domain_name_norm:
         return "Could you clarify which domain you are asking about?"
-    dom = db.query(Domain).filter(Domain.name.ilike(domain_name_norm)).first()
-    if dom:
-        return f"Yes, the domain **{dom.name}** is available in our system."
+    # Case-insensitive exact name match against the cached registry
+    dom_name = next(
+        (name for _, name, _ in _domain_rows(db) if name and name.lower() == domain_name_norm),
+        None,
+    )
+    if dom_name:
+        return f"Yes, the domain **{dom_name}** is available in our system."
     else:
         return f"Domain '{domain_name}' is not found in our system."
 
@@ -931,16 +1225,15 @@ def handle_domain_listing(
     """
     Handle domain listing queries: "Show all domains", "What domains do we have?"
     """
-    from app.utils.logging import get_logger
-    logger = get_logger("domain_listing")
-    domains = db.query(Domain).all()
-    logger.info(f"SQL: SELECT * FROM Domain")
+    domains = _domain_rows(db)
+    _LOG_DOMAIN_LISTING.info("Domain registry listing: %d domains (cached)", len(domains))
     if not domains:
         return "No domains are registered in the system."
-    lines = [f"• {d.name}" for d in domains]
+    lines = [f"• {name}" for _, name, _ in domains]
     return "Here are all domains in the system:\n\n" + "\n".join(lines)
 
 
+@_cached_metadata_answer
 def handle_domain_query(
     question: str,
     db: Session,
@@ -951,39 +1244,28 @@ def handle_domain_query(
     if hints is None:
         hints = {}
 
-    from app.utils.logging import get_logger
-    logger = get_logger("domain_query")
-
     q_norm = _normalize_registry_text(question)
     action = hints.get("domain_action")
 
-    is_doc_query = re.search(r"\bdocuments?\b", q_norm) is not None
+    is_doc_query = _RE_DOCUMENTS.search(q_norm) is not None
 
     # Topic-based registry listing (deterministic): "domains related to AI"
-    m = re.search(
-        r"\b(?:domains?|domins?)\b\s+(?:(?:are|is)\s+)?(?:related to|about|for|relevant to)\s+(.+?)\s*$",
-        q_norm,
-    )
+    m = _RE_DOMAINS_RELATED_TO.search(q_norm)
     if m:
         topic = (m.group(1) or "").strip()
         if not topic:
             return "Could you clarify which topic you want related domains for?"
 
-        domains = (
-            db.query(Domain)
-            .filter(
-                or_(
-                    Domain.name.ilike(f"%{topic}%"),
-                    Domain.description.ilike(f"%{topic}%"),
-                )
-            )
-            .order_by(Domain.name)
-            .all()
+        # Small registry: substring-match name/description on the cached rows
+        domains = sorted(
+            name
+            for _, name, description in _domain_rows(db)
+            if topic in (name or "").lower() or topic in (description or "").lower()
         )
-        logger.info("SQL: SELECT domains.* WHERE name/description ILIKE topic=%s", topic)
+        _LOG_DOMAIN_QUERY.info("Domain registry topic match: topic=%s matches=%d", topic, len(domains))
         if not domains:
             return f"No domains found related to '{topic}'."
-        lines = [f"• {d.name}" for d in domains]
+        lines = [f"• {name}" for name in domains]
         return f"Domains related to **{topic}**:\n\n" + "\n".join(lines)
 
     # Global domain registry operations
@@ -991,15 +1273,15 @@ def handle_domain_query(
         not is_doc_query
         and (
             action == "list"
-            or re.search(r"\b(show|list)\b.+\b(domains?|domins?)\b", q_norm)
+            or _RE_SHOW_LIST_DOMAINS.search(q_norm)
             or "what domains" in q_norm
         )
     ):
         return handle_domain_listing(db)
 
     if action == "count" or "how many domains" in q_norm or "number of domains" in q_norm:
-        cnt = db.query(func.count(Domain.id)).scalar() or 0
-        logger.info("SQL: SELECT COUNT(domains.id)")
+        cnt = len(_domain_rows(db))
+        _LOG_DOMAIN_QUERY.info("Domain registry count: %d (cached)", cnt)
         return f"There are **{cnt} domain{'s' if cnt != 1 else ''}** in the system."
 
     if action == "exists":
@@ -1015,7 +1297,7 @@ def handle_domain_query(
 
     # Default: treat as domain-specific summary/count across collections
     dom = _resolve_domain_from_registry(db, question, hints)
-    logger.info(
+    _LOG_DOMAIN_QUERY.info(
         "handle_domain_query: detected_domain=%s",
         dom.name if dom else None,
     )
@@ -1028,29 +1310,31 @@ def handle_domain_query(
         )
 
     # Authoritative domain constraint: documents.domain_id
+    # Category names come from the same query (one round trip, ordered in SQL)
     rows = (
-        db.query(Document.category_id, func.count(func.distinct(Document.id)))
+        db.query(Category.name, func.count(Document.id))
+        .select_from(Document)
+        .outerjoin(Category, Document.category_id == Category.id)
         .filter(Document.domain_id == dom.id, Document.processed == True)
-        .group_by(Document.category_id)
+        .group_by(Category.id, Category.name)
+        .order_by(Category.name)
         .all()
     )
-    logger.info(
-        "SQL: SELECT category_id, COUNT(DISTINCT documents.id) WHERE domain_id=%s GROUP BY category_id",
+    _LOG_DOMAIN_QUERY.info(
+        "SQL: SELECT categories.name, COUNT(documents.id) WHERE domain_id=%s GROUP BY category",
         dom.id,
     )
 
     if not rows:
         return f"The **{dom.name}** domain exists but has no documents yet."
 
-    cat_by_id = {c.id: c for c in categories}
     lines: list[str] = []
     total = 0
-    for category_id, ccount in rows:
+    for cat_name, ccount in rows:
         total += int(ccount or 0)
-        cat_name = cat_by_id.get(category_id).name if category_id in cat_by_id else "Uncategorized"
-        lines.append(f"• **{cat_name}**: {int(ccount or 0)}")
+        lines.append(f"• **{cat_name or 'Uncategorized'}**: {int(ccount or 0)}")
 
-    logger.info("Row count returned: %s", total)
+    _LOG_DOMAIN_QUERY.info("Row count returned: %s", total)
     return (
         f"The **{dom.name}** domain has **{total} document{'s' if total != 1 else ''}** across these collections:\n\n"
         + "\n".join(lines)
@@ -1080,99 +1364,100 @@ def handle_existence(
 
     # ---- Check by entity (document name) ----
     if entity:
-        docs = db.query(Document).filter(
+        match = (
             Document.title.ilike(f"%{entity}%"),
             Document.processed == True,
-        ).all()
+        )
+        # Only the first 5 titles are shown: fetch 6 (the 6th says "more exist")
+        # and count the full match set only in that case.
+        # id order: a title-only projection could otherwise be served from the title index
+        first = (
+            db.query(Document.title)
+            .filter(*match)
+            .order_by(Document.id)
+            .limit(6)
+            .all()
+        )
 
-        if docs:
-            titles = [f"• {d.title}" for d in docs[:5]]
-            plural = len(docs) != 1
+        if first:
+            total = len(first)
+            if total > 5:
+                total = db.query(func.count(Document.id)).filter(*match).scalar() or 0
+            titles = [f"• {title}" for (title,) in first[:5]]
+            plural = total != 1
             answer = (
                 f"Yes, there {'are' if plural else 'is'} "
-                f"**{len(docs)} document{'s' if plural else ''}** "
+                f"**{total} document{'s' if plural else ''}** "
                 f"related to **{entity}**:\n\n" + "\n".join(titles)
             )
-            if len(docs) > 5:
-                answer += f"\n\n...and {len(docs) - 5} more."
+            if total > 5:
+                answer += f"\n\n...and {total - 5} more."
             return answer
         # Don't return "not found" yet - check by type keyword below
 
     # ---- Check by search type keyword (proposal, policy, etc.) ----
     search_type = hints.get("search_type", "").lower()
     if search_type and search_type != "document":
-        # Build keywords to search for
-        type_kw_map = {
-            "proposal": ["proposal"],
-            "case_study": ["case stud", "case_stud"],
-            "case studies": ["case stud", "case_stud"],
-            "solution": ["solution"],
-            "service": ["service"],
-            "policy": ["policy", "policies"],
-            "pdf": ["pdf"],
-        }
-        search_keywords = type_kw_map.get(search_type, [search_type])
-        
-        # Search in document titles and descriptions
-        matching_docs = db.query(Document).filter(
-            Document.processed == True
-        ).all()
-        
-        found = []
-        for doc in matching_docs:
-            title_match = any(kw in doc.title.lower() for kw in search_keywords)
-            desc_match = (
-                doc.description and 
-                any(kw in doc.description.lower() for kw in search_keywords)
-            )
-            if title_match or desc_match:
-                found.append(doc)
+        search_keywords = _EXISTENCE_SEARCH_KEYWORDS.get(search_type, (search_type,))
         
+        # Search in document titles and descriptions (matched in SQL; only titles fetched)
+        # autoescape: "_" in keywords like "case_stud" is literal, not a LIKE wildcard
+        match = (
+            Document.processed == True,
+            or_(
+                *(Document.title.icontains(kw, autoescape=True) for kw in search_keywords),
+                *(Document.description.icontains(kw, autoescape=True) for kw in search_keywords),
+            ),
+        )
+        # Same 6-row page as the entity branch: count only when more than 5 match
+        found = [
+            title
+            for (title,) in db.query(Document.title)
+            .filter(*match)
+            .order_by(Document.id)
+            .limit(6)
+            .all()
+        ]
+
         if found:
-            titles = [f"• {d.title}" for d in found[:5]]
+            total = len(found)
+            if total > 5:
+                total = db.query(func.count(Document.id)).filter(*match).scalar() or 0
+            titles = [f"• {title}" for title in found[:5]]
             label = search_type.replace("_", " ").replace(" stud", " study")
-            plural = len(found) != 1
+            plural = total != 1
             answer = (
                 f"Yes, there {'are' if plural else 'is'} "
-                f"**{len(found)} {label} document{'s' if plural else ''}**:\n\n" + 
+                f"**{total} {label} document{'s' if plural else ''}**:\n\n" + 
                 "\n".join(titles)
             )
-            if len(found) > 5:
-                answer += f"\n\n...and {len(found) - 5} more."
+            if total > 5:
+                answer += f"\n\n...and {total - 5} more."
             return answer
 
     # ---- Check by category/type keywords in question ----
-    type_kw = {
-        "proposal": ["proposal"],
-        "case study": ["case stud", "case_stud"],
-        "case studies": ["case stud", "case_stud"],
-        "solution": ["solution"],
-        "service": ["service"],
-        "policy": ["policy", "policies"],
-    }
-    for type_name, keywords in type_kw.items():
-        if type_name in q:
-            cats = [
-                c for c in categories
-                if any(
-                    kw in c.name.lower() or kw in c.collection_name.lower()
-                    for kw in keywords
-                )
-            ]
-            if cats:
-                total = sum(
-                    db.query(Document)
-                    .filter(Document.category_id == c.id, Document.processed == True)
-                    .count()
-                    for c in cats
+    type_name = _EXISTENCE_TYPE_CLASSIFIER.classify(q)
+    if type_name is not None:
+        keywords = _EXISTENCE_TYPE_KEYWORDS[type_name]
+        cats = [
+            c for c in categories
+            if any(
+                kw in c.name.lower() or kw in c.collection_name.lower()
+                for kw in keywords
+            )
+        ]
+        if cats:
+            total = db.query(func.count(Document.id)).filter(
+                Document.category_id.in_([c.id for c in cats]),
+                Document.processed == True,
+            ).scalar() or 0
+            if total > 0:
+                return (
+                    f"Yes, there {'are' if total != 1 else 'is'} "
+                    f"**{total} {type_name} document{'s' if total != 1 else ''}**."
                 )
-                if total > 0:
-                    return (
-                        f"Yes, there {'are' if total != 1 else 'is'} "
-                        f"**{total} {type_name} document{'s' if total != 1 else ''}**."
-                    )
-                return f"The {type_name} category exists but has no documents yet."
-            return f"No, I don't have a category for {type_name} documents."
+            return f"The {type_name} category exists but has no documents yet."
+        return f"No, I don't have a category for {type_name} documents."
 
     # ---- Generic: Check if any documents exist ----
     total = db.query(Document).filter(Document.processed == True).count()
@@ -1186,11 +1471,11 @@ def handle_conversational(question: str) -> str:
     """Handle greetings and conversational messages."""
     q = question.lower().strip()
 
-    if q in {"thanks", "thank you"}:
+    if q in _THANKS_MESSAGES:
         return "You're welcome! Feel free to ask if you have more questions. 😊"
-    if q in {"bye", "goodbye", "see you"}:
+    if q in _GOODBYE_MESSAGES:
         return "Goodbye! Have a great day! 👋"
-    if q in {"ok", "okay", "sure", "great"}:
+    if q in _ACK_MESSAGES:
         return "Got it! Let me know if you need anything else."
 
     return (
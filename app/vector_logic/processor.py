@@ -11,6 +11,8 @@ from app.vector_logic.vector_store import (
     store_document_in_master_collection
 )
 from app.vector_logic.doc_types import infer_doc_type_for_document
+from app.vector_logic.description_generator import generate_description
+from app.vector_logic.intent_router import invalidate_metadata_answer_cache
 from app.core.config import settings
 from app.sqlite.database import SessionLocal
 
@@ -378,6 +380,7 @@ async def process_document_async(
             try:
                 document.processed = True
                 db.commit()
+                invalidate_metadata_answer_cache()
                 
                 # Update upload log
                 if upload_log:
@@ -448,3 +451,55 @@ def process_document_background(
     finally:
         loop.close()
 
+
+def generate_description_background(
+    document_id: int,
+    title: str,
+    category: str | None,
+    file_path: str,
+    domain: str | None = None
+):
+    """
+    Generate the AI description for an uploaded document outside the request.
+    Replaces the provisional description and records time/token usage on the
+    upload log in a single commit. Used with FastAPI BackgroundTasks.
+    """
+    start_time = time.time()
+    description, tokens_info = generate_description(
+        title=title,
+        category=category,
+        file_path=file_path,
+        openai_api_key=settings.openai_api_key,
+        domain=domain
+    )
+    generation_time = time.time() - start_time
+    
+    db = SessionLocal()
+    try:
+        document = db.get(Document, document_id)
+        if not document:
+            logger.error(f"Document {document_id} not found for description update")
+            return
+        document.description = description
+        
+        upload_log = (
+            db.query(DocumentUploadLog)
+            .filter(DocumentUploadLog.document_id == document_id)
+            .order_by(DocumentUploadLog.id.desc())
+            .first()
+        )
+        if upload_log:
+            upload_log.description_length = len(description)
+            upload_log.description_generation_time_seconds = generation_time
+            if tokens_info:
+                upload_log.description_tokens_used = tokens_info.get('total_tokens')
+                upload_log.description_tokens_prompt = tokens_info.get('prompt_tokens')
+                upload_log.description_tokens_completion = tokens_info.get('completion_tokens')
+        
+        db.commit()
+        logger.info(f"Generated description for document {document_id} in {generation_time:.2f}s")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error saving generated description for document {document_id}: {str(e)}")
+    finally:
+        db.close()
@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session, joinedload
 from app.sqlite.database import get_db
 from app.sqlite.models import Document, Category, Domain, User, DocumentUploadLog, QueryLog
 from app.core.security import get_current_admin_user
-from app.vector_logic.processor import process_document_background
+from app.vector_logic.processor import process_document_background, generate_description_background
 # Optional third-party dependencies (graceful fallbacks if missing)
 try:
     from openai import OpenAI as OpenAIClient
@@ -33,7 +33,8 @@ from app.vector_logic.schemas import (
     SourceChunk,
     AIDecisionResponse,
 )
-from app.vector_logic.description_generator import generate_description, refine_description
+from app.vector_logic.description_generator import _fallback_description, refine_description
+from app.services.llm import get_openai_client
 from app.vector_logic.vector_store import (
     list_collections,
     query_collection,
@@ -47,9 +48,10 @@ from app.vector_logic.intent_router import (
     handle_count, handle_classification, handle_existence, handle_conversational,
     handle_listing, handle_domain_query,
     recommend_solution, SOLUTION_KEYWORDS, handle_objection,
+    invalidate_metadata_answer_cache,
 )
 
-from app.utils.text import extract_entity
+from app.utils.text import CLARIFICATION_PHRASES, extract_entity
 
 import json
 import re
@@ -63,6 +65,14 @@ import shutil
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parents[2]
+
+# Conversational keyword tables for the query endpoint (built once at import)
+_QUESTION_WORDS = ("what", "how", "why", "when", "where", "who", "which", "explain", "describe", "tell me")
+_SIMPLE_GREETINGS = frozenset({"hi", "hello", "hey", "good morning", "good afternoon", "good evening"})
+_GREETINGS = _SIMPLE_GREETINGS | {"good night"}
+_THANKS = frozenset({"thanks", "thank you"})
+_FAREWELLS = frozenset({"bye", "goodbye", "see you"})
+_PURE_GREETINGS = _GREETINGS | _THANKS | _FAREWELLS | {"ok", "okay"}
 UPLOAD_DIR = BASE_DIR / "app/uploads"
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -542,34 +552,23 @@ def upload_document(
             shutil.copyfileobj(file.file, buffer)
 
         # -----------------------------
-        # 5. Generate description (always generate, unless explicitly provided)
-        # Track time and token usage
+        # 5. Description: the AI description (OpenAI call, often 5-30s) is
+        # generated by a background task so the upload returns right away.
+        # A provisional description is stored until it completes.
         # -----------------------------
         import time
         upload_start_time = time.time()
-        description_generation_time = None
-        description_tokens_info = None
+        description_generated = not description
         
-        if not description:
-            print(f"Generating description from full PDF for document: {title}")
-            desc_start_time = time.time()
+        if description_generated:
+            print(f"Scheduling description generation from full PDF for document: {title}")
             # Determine domain for description generation: prefer explicit domain selection
             domain_name = domain_obj.name if domain_obj else None
             if not domain_name and category_obj and category_obj.domains:
                 # Fallback to first domain associated with category
                 domain_name = category_obj.domains[0].name
-            description, description_tokens_info = generate_description(
-                title=title,
-                category=category_name,
-                file_path=str(file_path),
-                openai_api_key=settings.openai_api_key,
-                domain=domain_name
-            )
-            desc_end_time = time.time()
-            description_generation_time = desc_end_time - desc_start_time
-            print(f"Generated description: {description[:100]}...")
-            if description_tokens_info:
-                print(f"Description generation used {description_tokens_info.get('total_tokens', 0)} tokens in {description_generation_time:.2f}s")
+            # Same placeholder a failed background generation would store
+            description = _fallback_description(title, category_name, domain_name)
         else:
             print(f"Using provided description for document: {title}")
 
@@ -628,15 +627,12 @@ def upload_document(
             category_id=category_id,
             category=category_name,
             domain_id=domain_id,
-            description_generated=(description is None or description == ""),
-            description_length=len(description) if description else None,
+            description_generated=description_generated,
+            description_length=None if description_generated else len(description),
             processing_started=False,
             processing_completed=False,
             upload_time_seconds=upload_total_time,
-            description_generation_time_seconds=description_generation_time,
-            description_tokens_used=description_tokens_info.get('total_tokens') if description_tokens_info else None,
-            description_tokens_prompt=description_tokens_info.get('prompt_tokens') if description_tokens_info else None,
-            description_tokens_completion=description_tokens_info.get('completion_tokens') if description_tokens_info else None
+            # Description time/token columns are filled in by generate_description_background
         )
         db.add(upload_log)
         db.commit()
@@ -654,9 +650,19 @@ def upload_document(
             db.rollback()
 
         # -----------------------------
-        # 8. Schedule background processing with delay
+        # 8. Schedule background work. BackgroundTasks run in order, so the
+        # description is final before processing stores it in master_docs.
         # Use collection_name from category if available, otherwise default
         # -----------------------------
+        if description_generated:
+            background_tasks.add_task(
+                generate_description_background,
+                document_id=document.id,
+                title=title,
+                category=category_name,
+                file_path=str(file_path),
+                domain=domain_name,
+            )
         background_tasks.add_task(
             process_document_background,
             document_id=document.id,
@@ -765,6 +771,7 @@ def update_document(
         setattr(document, field, value)
     
     db.commit()
+    invalidate_metadata_answer_cache()
     db.refresh(document)
     return document
 
@@ -887,6 +894,7 @@ def delete_document(
     # Now delete from database (cascade will handle related records: DocumentVersion, DocumentChunk, etc.)
     db.delete(document)
     db.commit()
+    invalidate_metadata_answer_cache()
     
     print(f"Successfully deleted document {document_id} from SQLite and ChromaDB")
     return None
@@ -1121,7 +1129,8 @@ def ask_question(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="OpenAI library is not installed. Please install 'openai' to use this endpoint."
         )
-    client = OpenAIClient(api_key=settings.openai_api_key)
+    # Shared singleton: reuses the HTTP connection pool across requests
+    client = get_openai_client()
     
     # Initialize token tracking and API call responses
     token_usage_tracker = {
@@ -1156,16 +1165,13 @@ def ask_question(
         conversation_history = request.conversation_history or []
         conversation_length = len(conversation_history)
         is_follow_up = conversation_length > 0
-        is_clarification = any(
-            word in request.question.lower() 
-            for word in ["what do you mean", "can you explain", "clarify", "elaborate", "more details", "again"]
-        )
+        question_lc = request.question.lower()
+        is_clarification = any(word in question_lc for word in CLARIFICATION_PHRASES)
         
         # Analyze query complexity for dynamic model/token selection
         query_length = len(request.question)
-        question_words = ["what", "how", "why", "when", "where", "who", "which", "explain", "describe", "tell me"]
-        has_complex_question = any(word in request.question.lower() for word in question_words)
-        is_simple_greeting = request.question.lower().strip() in ["hi", "hello", "hey", "good morning", "good afternoon", "good evening"]
+        has_complex_question = any(word in question_lc for word in _QUESTION_WORDS)
+        is_simple_greeting = question_lc.strip() in _SIMPLE_GREETINGS
         
         print(f"Conversation Context: History={conversation_length} messages, Follow-up={is_follow_up}, Clarification={is_clarification}, Complex={has_complex_question}")
         
@@ -1181,13 +1187,25 @@ def ask_question(
         print(f"Step 0: Intent classification...")
         step0_start_time = time.time()
         
+        intent, intent_hints = classify_intent(request.question)
+        attribute = map_intent_to_attribute(intent)
+        # Greetings/thanks (METADATA_ONLY) are answered from templates below and
+        # never read the registry, so skip both queries for them
+        is_conversational = attribute == QuestionAttribute.METADATA_ONLY
+
         # Get categories (needed for both Step 0 and Step 1)
-        categories = db.query(Category).filter(Category.is_active == True).all()
+        categories = (
+            [] if is_conversational
+            else db.query(Category).filter(Category.is_active == True).all()
+        )
 
         # DB-backed domain presence detection (removes regex brittleness)
         # If a known domain appears in the question, we can force deterministic
         # metadata routing for registry-style questions.
-        domains = db.query(Domain).filter(Domain.is_active == True).all()
+        domains = (
+            [] if is_conversational
+            else db.query(Domain).filter(Domain.is_active == True).all()
+        )
         q_norm = (request.question or "").lower()
         q_norm = q_norm.replace("_", " ").replace("-", " ")
         q_norm = re.sub(r"[^a-z0-9\s]", " ", q_norm)
@@ -1203,9 +1221,6 @@ def ask_question(
             if dn and f" {dn} " in f" {q_norm} ":
                 detected_domain = d
                 break
-        
-        intent, intent_hints = classify_intent(request.question)
-        attribute = map_intent_to_attribute(intent)
 
         if detected_domain is not None:
             intent_hints = {**(intent_hints or {}), "domain_hint": detected_domain.name}
@@ -1585,12 +1600,7 @@ QUERY REFINEMENT GUIDANCE:
         # classification must control whether RAG is invoked. Log the situation
         # for observability but DO NOT change proceed_to_step2.
         _q_word_count = len(request.question.strip().split())
-        _pure_greetings = {
-            "hi", "hello", "hey", "good morning", "good afternoon",
-            "good evening", "good night", "thanks", "thank you",
-            "bye", "goodbye", "see you", "ok", "okay"
-        }
-        _is_pure_greeting = request.question.lower().strip() in _pure_greetings
+        _is_pure_greeting = question_lc.strip() in _PURE_GREETINGS
 
         if not proceed_to_step2 and not _is_pure_greeting and _q_word_count > 2:
             print(f"  SAFETY NET: Disabled. attribute={attribute.value}, proceed_to_step2 remains {proceed_to_step2}")
@@ -1613,11 +1623,11 @@ QUERY REFINEMENT GUIDANCE:
             else:
                 # Generate appropriate response based on query type
                 question_lower = request.question.lower().strip()
-                if question_lower in ["hi", "hello", "hey", "good morning", "good afternoon", "good evening", "good night"]:
+                if question_lower in _GREETINGS:
                     response = "Hello! 👋 I'm ASKMOJO, your AI assistant. I can help you find information from your documents. What would you like to know?"
-                elif question_lower in ["thanks", "thank you"]:
+                elif question_lower in _THANKS:
                     response = "You're welcome! Feel free to ask if you need anything else."
-                elif question_lower in ["bye", "goodbye", "see you"]:
+                elif question_lower in _FAREWELLS:
                     response = "Goodbye! Feel free to come back if you need any help."
                 else:
                     # Question not related to available collections